@@ -93,7 +93,8 @@ class RetrievalService(BaseService):
         self,
         query: str,
         limit: int = 5,
-        metadata_filter: Optional[Dict[str, Any]] = None
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        strategy: str = "pre"
     ) -> List[Document]:
         """
         Sucht nach Dokumenten basierend auf semantischer Ähnlichkeit.
@@ -102,6 +103,8 @@ class RetrievalService(BaseService):
             query: Suchanfrage
             limit: Maximale Anzahl zurückzugebender Dokumente
             metadata_filter: Optionale Filter für Dokument-Metadaten
+            strategy: Filterstrategie, "pre" (Vorfilter in der Datenbank)
+                oder "post" (Filter nach der Vektorsuche)
             
         Returns:
             Liste gefundener Dokumente, sortiert nach Relevanz
@@ -116,6 +119,30 @@ class RetrievalService(BaseService):
         """
         pass
     
+    @log_function_call(logger)
+    @abstractmethod
+    async def search_by_embedding(
+        self,
+        embedding: List[float],
+        limit: int = 5,
+        metadata_filter: Optional[Dict[str, Any]] = None
+    ) -> List[Document]:
+        """
+        Sucht nach Dokumenten anhand eines bereits berechneten Embeddings.
+        
+        Args:
+            embedding: Embedding-Vektor der Anfrage
+            limit: Maximale Anzahl zurückzugebender Dokumente
+            metadata_filter: Optionale Filter für Dokument-Metadaten
+        
+        Returns:
+            Liste gefundener Dokumente, sortiert nach Relevanz
+        
+        Raises:
+            RetrievalServiceError: Bei Suchfehlern
+        """
+        pass
+    
     @log_function_call(logger)
     @abstractmethod
     async def delete_document(self, document_id: str) -> bool:
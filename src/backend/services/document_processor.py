@@ -13,7 +13,6 @@ from src.config.logging_config import (
     get_logger, 
     log_execution_time,
     log_error_with_context,
-    request_context,
     log_function_call
 )
 
@@ -271,55 +270,54 @@ class DocumentProcessor(BaseService):
             raise DocumentProcessorError("Dokumenten-Prozessor nicht initialisiert")
         
         try:
-            with request_context():
-                with log_execution_time(self.logger, "document_processing"):
-                    # Inhalt bereinigen
-                    cleaned_content = self._clean_text(document.content)
-                    
-                    # In Chunks aufteilen
-                    chunks = self._splitter.split_text(cleaned_content)
+            with log_execution_time(self.logger, "document_processing"):
+                # Inhalt bereinigen
+                cleaned_content = self._clean_text(document.content)
+                
+                # In Chunks aufteilen
+                chunks = self._splitter.split_text(cleaned_content)
+                
+                # Zu kleine Chunks filtern
+                chunks = [
+                    chunk for chunk in chunks 
+                    if len(chunk) >= self.min_chunk_size
+                ]
+                
+                # Dokument-Chunks erstellen
+                doc_chunks = []
+                for i, chunk in enumerate(chunks):
+                    chunk_metadata = {
+                        "original_id": document.id,
+                        "chunk_index": i,
+                        "total_chunks": len(chunks)
+                    }
                     
-                    # Zu kleine Chunks filtern
-                    chunks = [
-                        chunk for chunk in chunks 
-                        if len(chunk) >= self.min_chunk_size
-                    ]
+                    if update_metadata:
+                        chunk_metadata.update(self._extract_metadata(chunk))
                     
-                    # Dokument-Chunks erstellen
-                    doc_chunks = []
-                    for i, chunk in enumerate(chunks):
-                        chunk_metadata = {
-                            "original_id": document.id,
-                            "chunk_index": i,
-                            "total_chunks": len(chunks)
-                        }
-                        
-                        if update_metadata:
-                            chunk_metadata.update(self._extract_metadata(chunk))
-                        
-                        if document.metadata:
-                            chunk_metadata.update(document.metadata)
-                        
-                        doc_chunks.append(Document(
-                            id=f"{document.id}_chunk_{i}",
-                            title=f"{document.title} (Chunk {i+1}/{len(chunks)})",
-                            content=chunk,
-                            source_link=document.source_link,  # Hier korrigiert von source zu source_link
-                            document_type=document.document_type,
-                            metadata=chunk_metadata,
-                            created_at=document.created_at
-                        ))
+                    if document.metadata:
+                        chunk_metadata.update(document.metadata)
                     
-                    self.logger.info(
-                        f"Dokument verarbeitet",
-                        extra={
-                            "document_id": document.id,
-                            "chunks_created": len(doc_chunks),
-                            "original_length": len(document.content),
-                            "processed_length": sum(len(c.content) for c in doc_chunks)
-                        }
-                    )
-                    return doc_chunks
+                    doc_chunks.append(Document(
+                        id=f"{document.id}_chunk_{i}",
+                        title=f"{document.title} (Chunk {i+1}/{len(chunks)})",
+                        content=chunk,
+                        source_link=document.source_link,  # Hier korrigiert von source zu source_link
+                        document_type=document.document_type,
+                        metadata=chunk_metadata,
+                        created_at=document.created_at
+                    ))
+                
+                self.logger.info(
+                    f"Dokument verarbeitet",
+                    extra={
+                        "document_id": document.id,
+                        "chunks_created": len(doc_chunks),
+                        "original_length": len(document.content),
+                        "processed_length": sum(len(c.content) for c in doc_chunks)
+                    }
+                )
+                return doc_chunks
             
         except Exception as e:
             error_context = {
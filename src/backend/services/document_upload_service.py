@@ -6,10 +6,13 @@ Koordiniert den Upload-Prozess zwischen UI, Dokumentenverarbeitung und Datenbank
 from typing import List, Dict, Any, Optional, BinaryIO
 from datetime import datetime
 import uuid
+import asyncio
 import tempfile
 import os
 from pathlib import Path
 
+import numpy as np
+
 from src.config.settings import settings
 from src.config.logging_config import (
     get_logger, 
@@ -180,6 +183,10 @@ class DocumentUploadService:
         """
         Speichert Dokument-Chunks in der Vektordatenbank.
         
+        Die Chunks werden in Batches verarbeitet: Embeddings werden je Batch
+        mit einem Aufruf erzeugt, und die Embeddings des nächsten Batches
+        entstehen bereits, während der aktuelle Batch geschrieben wird.
+        
         Args:
             chunks: Liste der zu speichernden Document-Objekte
             
@@ -188,72 +195,53 @@ class DocumentUploadService:
                 - Wenn die Embeddings nicht erstellt werden können
                 - Wenn die Speicherung in der Datenbank fehlschlägt
         """
+        if not chunks:
+            return
+        
+        batch_size = settings.database.batch_size
+        batches = [
+            chunks[start:start + batch_size]
+            for start in range(0, len(chunks), batch_size)
+        ]
+        pending_embeddings = None
+        
         try:
-            # Listen für die Datenbank vorbereiten
-            ids = []
-            embeddings = []
-            documents = []
-            metadatas = []
+            pending_embeddings = asyncio.create_task(
+                self._embed_chunks(batches[0])
+            )
             
-            # Über alle Chunks iterieren und Daten sammeln
-            for chunk in chunks:
-                # Embedding für den Chunk erstellen
-                try:
-                    embedding = await self.embedding_service.get_embedding(chunk.content)
-                except Exception as e:
-                    raise DocumentUploadError(
-                        f"Fehler bei Embedding-Erstellung für Chunk {chunk.id}: {str(e)}"
-                    )
-                
-                # Daten für den DB-Upload sammeln
-                ids.append(chunk.id)
-                embeddings.append(embedding)
-                documents.append(chunk.content)
-                
-                # Metadaten vorbereiten und Listen in Strings konvertieren
-                metadata = {
-                    "title": chunk.title,
-                    "source_link": chunk.source_link,
-                    "document_type": chunk.document_type.value,
-                    "created_at": chunk.created_at.isoformat(),
-                    "language": chunk.language,
-                }
+            for index, batch in enumerate(batches):
+                embeddings = await pending_embeddings
                 
-                # Zusätzliche Metadaten verarbeiten und Listen in Strings konvertieren
-                for key, value in chunk.metadata.items():
-                    if isinstance(value, list):
-                        metadata[key] = ', '.join(map(str, value))
-                    elif isinstance(value, (str, int, float, bool)):
-                        metadata[key] = value
-                    else:
-                        metadata[key] = str(value)
-                
-                # Topics separat behandeln, falls vorhanden
-                if hasattr(chunk, 'topics') and chunk.topics:
-                    metadata['topics'] = ', '.join(map(str, chunk.topics))
+                # Nächsten Batch vorberechnen, während dieser geschrieben wird
+                if index + 1 < len(batches):
+                    pending_embeddings = asyncio.create_task(
+                        self._embed_chunks(batches[index + 1])
+                    )
                 
-                metadatas.append(metadata)
-            
-            # Chunks in der Datenbank speichern
-            await self.db_manager.add_documents(
-                ids=ids,
-                embeddings=embeddings,
-                documents=documents,
-                metadatas=metadatas
-            )
+                # Chunks in der Datenbank speichern
+                await self.db_manager.add_documents(
+                    ids=[chunk.id for chunk in batch],
+                    embeddings=embeddings,
+                    documents=[chunk.content for chunk in batch],
+                    metadatas=[self._chunk_metadata(chunk) for chunk in batch]
+                )
             
             self.logger.info(
                 "Chunks erfolgreich gespeichert",
                 extra={
                     "chunk_count": len(chunks),
-                    "first_chunk_id": chunks[0].id if chunks else None
+                    "batch_count": len(batches),
+                    "first_chunk_id": chunks[0].id
                 }
             )
             
         except Exception as e:
+            if pending_embeddings is not None and not pending_embeddings.done():
+                pending_embeddings.cancel()
             error_context = {
                 "chunk_count": len(chunks),
-                "first_chunk_id": chunks[0].id if chunks else None
+                "first_chunk_id": chunks[0].id
             }
             log_error_with_context(
                 self.logger,
@@ -263,6 +251,59 @@ class DocumentUploadService:
             )
             raise DocumentUploadError(f"Fehler bei Chunk-Speicherung: {str(e)}")
     
+    async def _embed_chunks(self, chunks: List[Document]) -> np.ndarray:
+        """
+        Erzeugt die Embeddings eines Chunk-Batches mit einem Aufruf.
+        
+        Args:
+            chunks: Chunks des Batches
+            
+        Returns:
+            float32-Matrix der Embeddings in Chunk-Reihenfolge
+            
+        Raises:
+            DocumentUploadError: Wenn die Embeddings nicht erstellt werden können
+        """
+        try:
+            return await self.embedding_service.get_embeddings(
+                [chunk.content for chunk in chunks]
+            )
+        except Exception as e:
+            raise DocumentUploadError(
+                f"Fehler bei Embedding-Erstellung für Chunks "
+                f"{chunks[0].id} bis {chunks[-1].id}: {str(e)}"
+            )
+    
+    @staticmethod
+    def _chunk_metadata(chunk: Document) -> Dict[str, Any]:
+        """
+        Bereitet die Metadaten eines Chunks für ChromaDB vor.
+        
+        Die Umwandlung in skalare Werte übernimmt der ChromaDBManager.
+        
+        Args:
+            chunk: Zu speichernder Chunk
+            
+        Returns:
+            Flaches Metadaten-Dictionary
+        """
+        metadata = {
+            "title": chunk.title,
+            "source_link": chunk.source_link,
+            "document_type": chunk.document_type.value,
+            "created_at": chunk.created_at.isoformat(),
+            "language": chunk.language,
+        }
+        
+        # Zusätzliche Metadaten übernehmen
+        metadata.update(chunk.metadata)
+        
+        # Topics separat behandeln, falls vorhanden
+        if hasattr(chunk, 'topics') and chunk.topics:
+            metadata['topics'] = chunk.topics
+        
+        return metadata
+    
     async def _validate_file(self, file: BinaryIO) -> None:
         """
         Validiert eine hochgeladene Datei.
@@ -3,8 +3,10 @@ Embedding-Service-Modul.
 Verantwortlich für die Generierung und Verwaltung von Text-Embeddings mittels OpenAI.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple, Union
+from collections import OrderedDict
 import asyncio
+import hashlib
 from functools import lru_cache
 import numpy as np
 from langchain_openai import OpenAIEmbeddings
@@ -23,12 +25,21 @@ from ..interfaces.base import BaseService, ServiceError
 # Logger für dieses Modul initialisieren
 logger = get_logger(__name__)
 
+def _stack_embeddings(vectors: List[Any]) -> np.ndarray:
+    """Fasst Einzelvektoren zu einer zusammenhängenden float32-Matrix zusammen."""
+    if not vectors:
+        return np.empty((0, 0), dtype=np.float32)
+    return np.array(vectors, dtype=np.float32)
+
 class EmbeddingCache:
     """
     Cache-Implementierung für Embeddings.
     
     Bietet Thread-sicheres Caching von Embedding-Vektoren zur 
-    Vermeidung redundanter API-Aufrufe.
+    Vermeidung redundanter API-Aufrufe. Vektoren werden als kompakte
+    float32-Arrays statt als Listen von Python-Floats gehalten, als
+    Schlüssel dient ein 128-Bit-Hash des Textes. Verdrängt wird der am
+    längsten nicht genutzte Eintrag.
     """
     
     def __init__(self, max_size: int = 10000):
@@ -38,12 +49,12 @@ class EmbeddingCache:
         Args:
             max_size: Maximale Anzahl der zu cachenden Embeddings
         """
-        self.cache: Dict[str, List[float]] = {}
+        self.cache: OrderedDict[bytes, np.ndarray] = OrderedDict()
         self.max_size = max_size
         self._lock = asyncio.Lock()
         self.logger = get_logger(f"{__name__}.EmbeddingCache")
 
-    async def get(self, key: str) -> Optional[List[float]]:
+    async def get(self, key: str) -> Optional[np.ndarray]:
         """
         Ruft ein Embedding aus dem Cache ab.
         
@@ -51,10 +62,13 @@ class EmbeddingCache:
             key: Cache-Schlüssel (normalerweise der Text)
             
         Returns:
-            Gecachter Embedding-Vektor oder None wenn nicht gefunden
+            Gecachter, schreibgeschützter float32-Vektor oder None wenn
+            nicht gefunden
         """
+        cache_key = self._hash_key(key)
         async with self._lock:
-            if embedding := self.cache.get(key):
+            if (embedding := self.cache.get(cache_key)) is not None:
+                self.cache.move_to_end(cache_key)
                 self.logger.debug(
                     "Cache-Treffer",
                     extra={"key_length": len(key)}
@@ -67,7 +81,7 @@ class EmbeddingCache:
             )
             return None
 
-    async def set(self, key: str, value: List[float]) -> None:
+    async def set(self, key: str, value: Union[np.ndarray, List[float]]) -> None:
         """
         Speichert ein Embedding im Cache.
         
@@ -75,17 +89,18 @@ class EmbeddingCache:
             key: Cache-Schlüssel
             value: Zu cachender Embedding-Vektor
         """
+        cache_key = self._hash_key(key)
         async with self._lock:
-            if len(self.cache) >= self.max_size:
-                # Ältesten Eintrag entfernen wenn Cache voll
-                oldest_key = next(iter(self.cache))
-                del self.cache[oldest_key]
-                self.logger.debug(
-                    "Cache-Eintrag entfernt",
-                    extra={"removed_key_length": len(oldest_key)}
-                )
+            if cache_key not in self.cache and len(self.cache) >= self.max_size:
+                # Am längsten nicht genutzten Eintrag entfernen wenn Cache voll
+                self.cache.popitem(last=False)
+                self.logger.debug("Cache-Eintrag entfernt")
             
-            self.cache[key] = value
+            embedding = np.array(value, dtype=np.float32)
+            # Gecachte Vektoren werden ohne Kopie herausgegeben
+            embedding.setflags(write=False)
+            self.cache[cache_key] = embedding
+            self.cache.move_to_end(cache_key)
             self.logger.debug(
                 "Cache-Eintrag hinzugefügt",
                 extra={
@@ -94,6 +109,11 @@ class EmbeddingCache:
                 }
             )
 
+    @staticmethod
+    def _hash_key(text: str) -> bytes:
+        """Bildet einen kompakten Cache-Schlüssel aus dem Text."""
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
     def clear(self) -> None:
         """Leert den Cache."""
         self.logger.info(
@@ -186,7 +206,7 @@ class EmbeddingService(BaseService):
         texts: List[str],
         retry_attempts: int = 3,
         retry_delay: float = 1.0
-    ) -> List[List[float]]:
+    ) -> np.ndarray:
         """
         Generiert Embeddings für eine Liste von Texten mit Retry-Logik.
         
@@ -196,7 +216,7 @@ class EmbeddingService(BaseService):
             retry_delay: Verzögerung zwischen Wiederholungsversuchen in Sekunden
             
         Returns:
-            Liste von Embedding-Vektoren
+            float32-Matrix der Form (Anzahl Texte, Dimension)
             
         Raises:
             EmbeddingServiceError: Bei Fehlern in der Embedding-Generierung
@@ -212,7 +232,7 @@ class EmbeddingService(BaseService):
                     missing_indices = []
                     
                     for i, text in enumerate(texts):
-                        if cached := await self._cache.get(text):
+                        if (cached := await self._cache.get(text)) is not None:
                             cached_results.append(cached)
                         else:
                             cached_results.append(None)
@@ -223,7 +243,7 @@ class EmbeddingService(BaseService):
                             "Alle Embeddings im Cache gefunden",
                             extra={"total_texts": len(texts)}
                         )
-                        return [r for r in cached_results if r is not None]
+                        return _stack_embeddings(cached_results)
                     
                     # Fehlende Embeddings in Batches verarbeiten
                     missing_texts = [texts[i] for i in missing_indices]
@@ -271,7 +291,7 @@ class EmbeddingService(BaseService):
                         }
                     )
                     
-                    return [r for r in cached_results if r is not None]
+                    return _stack_embeddings(cached_results)
                 
             except Exception as e:
                 error_context = {
@@ -291,7 +311,7 @@ class EmbeddingService(BaseService):
         self,
         text: str,
         retry_attempts: int = 3
-    ) -> List[float]:
+    ) -> np.ndarray:
         """
         Generiert ein Embedding für einen einzelnen Text.
         
@@ -300,7 +320,7 @@ class EmbeddingService(BaseService):
             retry_attempts: Maximale Anzahl von Wiederholungsversuchen
             
         Returns:
-            Embedding-Vektor
+            Embedding-Vektor als float32-Array
             
         Raises:
             EmbeddingServiceError: Bei Fehlern in der Embedding-Generierung
@@ -352,4 +372,101 @@ class EmbeddingService(BaseService):
             )
             raise EmbeddingServiceError(
                 f"Ähnlichkeitsberechnung fehlgeschlagen: {str(e)}"
-            )
\ No newline at end of file
+            )
+
+
+class EmbeddingBatcher:
+    """
+    Bündelt gleichzeitige Einzelanfragen zu gemeinsamen Batch-Aufrufen.
+    
+    Anfragen, die im selben Durchlauf der Event-Loop eintreffen, werden
+    mit einem einzigen get_embeddings-Aufruf verarbeitet. Nur während ein
+    Batch läuft, wird bis zu max_wait auf weitere Anfragen gewartet; eine
+    einzelne Anfrage wird damit ohne zusätzliche Verzögerung verarbeitet.
+    Das spart bei parallelen Suchanfragen API-Roundtrips, die sonst
+    nacheinander über den Lock des Embedding-Services laufen würden.
+    """
+    
+    def __init__(
+        self,
+        embedding_service: EmbeddingService,
+        max_batch_size: int = 32,
+        max_wait: float = 0.005
+    ):
+        """
+        Initialisiert den Embedding-Batcher.
+        
+        Args:
+            embedding_service: Service für die eigentliche Embedding-Generierung
+            max_batch_size: Batch-Größe, ab der sofort verarbeitet wird
+            max_wait: Maximale Wartezeit auf weitere Anfragen in Sekunden,
+                solange noch ein Batch verarbeitet wird
+        """
+        self._service = embedding_service
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.logger = get_logger(f"{__name__}.EmbeddingBatcher")
+    
+    async def get_embedding(self, text: str) -> np.ndarray:
+        """
+        Generiert ein Embedding, gebündelt mit gleichzeitigen Anfragen.
+        
+        Args:
+            text: Zu verarbeitender Text
+            
+        Returns:
+            Embedding-Vektor als float32-Array
+            
+        Raises:
+            EmbeddingServiceError: Bei Fehlern in der Embedding-Generierung
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+        
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            if self._tasks:
+                # Während ein Batch läuft, weitere Anfragen sammeln
+                self._flush_handle = loop.call_later(self._max_wait, self._flush)
+            else:
+                # Sonst nur die Anfragen desselben Loop-Durchlaufs bündeln
+                self._flush_handle = loop.call_soon(self._flush)
+        
+        return await future
+    
+    def _flush(self) -> None:
+        """Startet die Verarbeitung aller wartenden Anfragen."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._process_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _process_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Verarbeitet einen Batch und verteilt die Ergebnisse."""
+        try:
+            embeddings = await self._service.get_embeddings(
+                [text for text, _ in batch]
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        self.logger.debug(
+            "Embedding-Batch verarbeitet",
+            extra={"batch_size": len(batch)}
+        )
+        for (_, future), embedding in zip(batch, embeddings):
+            if not future.done():
+                future.set_result(embedding)
@@ -3,7 +3,7 @@ Cache Manager Modul.
 Verantwortlich für das Caching von Dokumenten mit Thread-Sicherheit und Konfigurierbarkeit.
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import asyncio
 from datetime import datetime, timedelta
 from collections import OrderedDict
@@ -176,8 +176,10 @@ class CacheManager:
         try:
             with self._lock:
                 # Cache-Größe prüfen und ggf. LRU-Eintrag entfernen
-                while len(self._cache) >= self._max_size:
-                    self._remove_lru_entry()
+                # (Ersetzen eines vorhandenen Eintrags vergrößert den Cache nicht)
+                if document.id not in self._cache:
+                    while len(self._cache) >= self._max_size:
+                        self._remove_lru_entry()
                 
                 # Neuen Eintrag erstellen
                 self._cache[document.id] = CacheEntry(
@@ -201,6 +203,46 @@ class CacheManager:
                 extra={"document_id": document.id}
             )
     
+    @log_function_call(logger)
+    async def put_many(
+        self,
+        documents: List[Document],
+        ttl: Optional[int] = None
+    ) -> None:
+        """
+        Fügt mehrere Dokumente mit einer einzigen Lock-Akquisition hinzu.
+        
+        Args:
+            documents: Zu cachende Dokumente
+            ttl: Optionale TTL-Überschreibung
+        """
+        try:
+            with self._lock:
+                for document in documents:
+                    if document.id not in self._cache:
+                        while len(self._cache) >= self._max_size:
+                            self._remove_lru_entry()
+                    
+                    self._cache[document.id] = CacheEntry(
+                        document,
+                        ttl or self._default_ttl
+                    )
+                    self._cache.move_to_end(document.id)
+                
+                self.logger.debug(
+                    "Dokumente gecacht",
+                    extra={
+                        "document_count": len(documents),
+                        "cache_size": len(self._cache)
+                    }
+                )
+        
+        except Exception as e:
+            self.logger.error(
+                f"Fehler beim Caching: {str(e)}",
+                extra={"document_count": len(documents)}
+            )
+    
     @log_function_call(logger)
     async def remove(self, document_id: str) -> bool:
         """
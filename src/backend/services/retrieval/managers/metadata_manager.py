@@ -5,8 +5,10 @@ Verantwortlich für die Verwaltung und Verarbeitung von Dokumenten-Metadaten.
 
 from typing import Dict, Any, List, Optional, Set
 from datetime import datetime
+import asyncio
 import re
-from collections import defaultdict
+import hashlib
+from collections import Counter, OrderedDict
 
 from src.config.settings import settings
 from src.config.logging_config import (
@@ -21,6 +23,56 @@ from src.backend.interfaces.base import ServiceError
 # Logger für dieses Modul initialisieren
 logger = get_logger(__name__)
 
+# Deutsche Indikatorwörter für die Spracherkennung (nur ganze Wörter)
+_GERMAN_INDICATORS_RE = re.compile(
+    r'\b(?:der|die|das|und|ist|sind|werden|fahrzeug|prüfung|vorschrift)\b',
+    re.IGNORECASE
+)
+
+# Tokenisierung in Wörter
+_WORD_RE = re.compile(r'\b\w+\b')
+
+# Satzgrenzen und durch Leerzeichen/Satzzeichen getrennte Wörter
+_SENTENCE_END_RE = re.compile(r'[.!?]+')
+_SENTENCE_WORD_RE = re.compile(r'[^\s.!?]+')
+
+# Validierungsschema für Metadaten (einmalig definiert)
+_MISSING = object()
+_REQUIRED_METADATA_FIELDS = ("created_at", "content_length", "language")
+_METADATA_FIELD_TYPES = (
+    ("created_at", str),
+    ("content_length", int),
+    ("language", str),
+    ("topics", list),
+    ("keywords", list)
+)
+
+# Stopwörter für die Keyword-Extraktion (vereinfachte Liste)
+_STOPWORDS = frozenset({
+    "der", "die", "das", "und", "in", "im", "für", "mit",
+    "bei", "seit", "von", "aus", "nach", "zu", "zur", "zum"
+})
+
+# Fachbegriffe für den Komplexitätsscore
+_TECHNICAL_TERMS = frozenset({
+    "abs", "esp", "asv", "tcs", "egr", "dpf", "scr", "obd",
+    "ecu", "can", "lin", "iso", "sae", "din", "ece", "etk"
+})
+
+def _freeze_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Legt Listenwerte als Tupel ab, damit Cache-Einträge unveränderlich sind."""
+    return {
+        key: tuple(value) if isinstance(value, list) else value
+        for key, value in metadata.items()
+    }
+
+def _thaw_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Erzeugt aus einem Cache-Eintrag Metadaten mit eigenen Listen."""
+    return {
+        key: list(value) if isinstance(value, tuple) else value
+        for key, value in metadata.items()
+    }
+
 class MetadataManagerError(ServiceError):
     """Spezifische Exception für Metadaten-Manager-Fehler."""
     pass
@@ -36,9 +88,17 @@ class MetadataManager:
     - Statistiken und Aggregationen
     """
     
-    def __init__(self):
-        """Initialisiert den Metadata-Manager."""
+    def __init__(self, cache_size: int = 4096):
+        """
+        Initialisiert den Metadata-Manager.
+        
+        Args:
+            cache_size: Maximale Anzahl gecachter Extraktionsergebnisse
+        """
         self.logger = get_logger(f"{__name__}.{self.__class__.__name__}")
+        # LRU-Cache für Extraktionsergebnisse (Schlüssel: Inhalts-Hash)
+        self._meta_cache: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        self._meta_cache_size = cache_size
         # Initialisiere Wörterbuch für Themenerkennung
         self._topic_keywords = {
             "sicherheit": [
@@ -63,6 +123,21 @@ class MetadataManager:
             ]
         }
     
+    def content_hash(self, content: str) -> str:
+        """
+        Berechnet einen kompakten Hash des Dokumenteninhalts.
+        
+        Args:
+            content: Dokumenteninhalt
+            
+        Returns:
+            Hex-kodierter 128-Bit-BLAKE2b-Hash
+        """
+        return hashlib.blake2b(
+            content.encode("utf-8"),
+            digest_size=16
+        ).hexdigest()
+    
     @log_function_call(logger)
     async def extract_metadata(self, content: str) -> Dict[str, Any]:
         """
@@ -75,15 +150,18 @@ class MetadataManager:
             Dictionary mit extrahierten Metadaten
         """
         try:
+            # Identische Inhalte (Re-Uploads, Updates) nicht erneut analysieren
+            cache_key = self.content_hash(content)
+            if (cached := self._meta_cache.get(cache_key)) is not None:
+                self._meta_cache.move_to_end(cache_key)
+                metadata = _thaw_metadata(cached)
+                metadata["extracted_at"] = datetime.utcnow().isoformat()
+                return metadata
+            
             with log_execution_time(self.logger, "metadata_extraction"):
-                metadata = {
-                    "extracted_at": datetime.utcnow().isoformat(),
-                    "content_length": len(content),
-                    "language": await self._detect_language(content),
-                    "topics": await self._extract_topics(content),
-                    "keywords": await self._extract_keywords(content),
-                    "complexity_score": await self._calculate_complexity(content)
-                }
+                # Reine CPU-Arbeit im Worker-Thread, Event-Loop bleibt frei
+                metadata = await asyncio.to_thread(self._extract_sync, content)
+                metadata["content_hash"] = cache_key
                 
                 self.logger.debug(
                     "Metadaten extrahiert",
@@ -92,6 +170,11 @@ class MetadataManager:
                         "topics_count": len(metadata["topics"])
                     }
                 )
+                
+                self._meta_cache[cache_key] = _freeze_metadata(metadata)
+                if len(self._meta_cache) > self._meta_cache_size:
+                    self._meta_cache.popitem(last=False)
+                
                 return metadata
                 
         except Exception as e:
@@ -104,6 +187,29 @@ class MetadataManager:
             )
             raise MetadataManagerError(f"Metadaten-Extraktion fehlgeschlagen: {str(e)}")
     
+    def _extract_sync(self, content: str) -> Dict[str, Any]:
+        """
+        Synchroner Kern der Metadaten-Extraktion.
+        
+        Args:
+            content: Dokumenteninhalt
+            
+        Returns:
+            Dictionary mit extrahierten Metadaten
+        """
+        # Inhalt nur einmal normalisieren und tokenisieren
+        content_lower = content.lower()
+        words = _WORD_RE.findall(content_lower)
+        
+        return {
+            "extracted_at": datetime.utcnow().isoformat(),
+            "content_length": len(content),
+            "language": self._detect_language(content),
+            "topics": self._extract_topics(content_lower),
+            "keywords": self._extract_keywords(words),
+            "complexity_score": self._calculate_complexity(content, words)
+        }
+    
     @log_function_call(logger)
     async def merge_metadata(
         self,
@@ -122,21 +228,31 @@ class MetadataManager:
         """
         try:
             merged = base_metadata.copy()
+            changed = False
             
-            # Listen zusammenführen und Duplikate entfernen
-            for key in ["topics", "keywords"]:
-                if key in new_metadata:
-                    existing = set(merged.get(key, []))
-                    new_items = set(new_metadata[key])
-                    merged[key] = list(existing | new_items)
+            # Listen zusammenführen und Duplikate unter Erhalt der Reihenfolge entfernen
+            for key in ("topics", "keywords"):
+                new_items = new_metadata.get(key) or []
+                if not new_items:
+                    continue
+                existing = merged.get(key) or []
+                # Tupel aus dem Cache und einzelne Strings aus Altdaten zulassen
+                if isinstance(existing, str):
+                    existing = [existing]
+                if isinstance(new_items, str):
+                    new_items = [new_items]
+                merged[key] = list(dict.fromkeys([*existing, *new_items]))
+                changed = True
             
             # Numerische Werte aktualisieren
-            for key in ["complexity_score", "importance_score"]:
+            for key in ("complexity_score", "importance_score"):
                 if key in new_metadata:
                     merged[key] = new_metadata[key]
+                    changed = True
             
-            # Zeitstempel aktualisieren
-            merged["updated_at"] = datetime.utcnow().isoformat()
+            # Zeitstempel nur bei tatsächlichen Änderungen aktualisieren
+            if changed:
+                merged["updated_at"] = datetime.utcnow().isoformat()
             
             self.logger.debug(
                 "Metadaten zusammengeführt",
@@ -163,7 +279,7 @@ class MetadataManager:
                 f"Metadaten-Zusammenführung fehlgeschlagen: {str(e)}"
             )
     
-    async def _detect_language(self, content: str) -> str:
+    def _detect_language(self, content: str) -> str:
         """
         Erkennt die Sprache des Inhalts.
         
@@ -174,26 +290,28 @@ class MetadataManager:
             Erkannter Sprachcode
         """
         # Vereinfachte Implementierung - sollte in Produktion durch
-        # eine richtige Spracherkennungsbibliothek ersetzt werden
-        german_indicators = [
-            "der", "die", "das", "und", "ist", "sind", "werden",
-            "fahrzeug", "prüfung", "vorschrift"
-        ]
-        text_lower = content.lower()
-        german_word_count = sum(1 for word in german_indicators if word in text_lower)
-        return "de" if german_word_count >= 3 else "en"
+        # eine richtige Spracherkennungsbibliothek ersetzt werden.
+        # Ein einziger Durchlauf, Abbruch sobald drei Treffer gefunden sind.
+        german_word_count = 0
+        for _ in _GERMAN_INDICATORS_RE.finditer(content):
+            german_word_count += 1
+            if german_word_count >= 3:
+                return "de"
+        return "en"
     
-    async def _extract_topics(self, content: str) -> List[str]:
+    def _extract_topics(self, content_lower: str) -> List[str]:
         """
         Extrahiert relevante Themen aus dem Inhalt.
         
+        Die Schlüsselwörter werden als Teilstrings gesucht, damit auch
+        Komposita (z.B. "Motorsteuerung") erkannt werden.
+        
         Args:
-            content: Zu analysierender Text
+            content_lower: Zu analysierender Text in Kleinbuchstaben
             
         Returns:
             Liste erkannter Themen
         """
-        content_lower = content.lower()
         found_topics = []
         
         # Themen basierend auf Schlüsselwörtern erkennen
@@ -203,46 +321,33 @@ class MetadataManager:
         
         return found_topics
     
-    async def _extract_keywords(self, content: str) -> List[str]:
+    def _extract_keywords(self, words: List[str]) -> List[str]:
         """
         Extrahiert wichtige Schlüsselwörter.
         
         Args:
-            content: Zu analysierender Text
+            words: Tokenisierte, kleingeschriebene Wörter des Textes
             
         Returns:
             Liste wichtiger Schlüsselwörter
         """
-        # Wörter extrahieren und normalisieren
-        words = re.findall(r'\b\w+\b', content.lower())
-        
-        # Stopwörter filtern (vereinfachte Liste)
-        stopwords = {
-            "der", "die", "das", "und", "in", "im", "für", "mit",
-            "bei", "seit", "von", "aus", "nach", "zu", "zur", "zum"
-        }
-        filtered_words = [w for w in words if w not in stopwords]
-        
-        # Worthäufigkeiten zählen
-        word_freq = defaultdict(int)
-        for word in filtered_words:
-            word_freq[word] += 1
+        # Worthäufigkeiten in einem Durchlauf zählen, Stopwörter dabei filtern
+        stopwords = _STOPWORDS
+        word_freq = Counter()
+        for word in words:
+            if word not in stopwords:
+                word_freq[word] += 1
         
         # Top-Keywords basierend auf Häufigkeit
-        keywords = sorted(
-            word_freq.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:10]
-        
-        return [word for word, _ in keywords]
+        return [word for word, _ in word_freq.most_common(10)]
     
-    async def _calculate_complexity(self, content: str) -> float:
+    def _calculate_complexity(self, content: str, words: List[str]) -> float:
         """
         Berechnet einen Komplexitätsscore für den Inhalt.
         
         Args:
             content: Zu analysierender Text
+            words: Tokenisierte, kleingeschriebene Wörter des Textes
             
         Returns:
             Komplexitätsscore zwischen 0 und 1
@@ -251,8 +356,8 @@ class MetadataManager:
             # Verschiedene Faktoren für Komplexität
             factors = {
                 "sentence_length": self._avg_sentence_length(content),
-                "word_length": self._avg_word_length(content),
-                "special_terms": self._count_special_terms(content),
+                "word_length": self._avg_word_length(words),
+                "special_terms": self._count_special_terms(set(words)),
             }
             
             # Gewichtete Summe der Faktoren
@@ -270,25 +375,20 @@ class MetadataManager:
     
     def _avg_sentence_length(self, text: str) -> float:
         """Berechnet durchschnittliche Satzlänge."""
-        sentences = re.split(r'[.!?]+', text)
-        if not sentences:
-            return 0
-        return sum(len(s.split()) for s in sentences) / len(sentences)
+        # Zählt direkt statt Satzfragmente und Wortlisten zu erzeugen;
+        # entspricht der Aufteilung per re.split() und str.split()
+        sentence_count = len(_SENTENCE_END_RE.findall(text)) + 1
+        return len(_SENTENCE_WORD_RE.findall(text)) / sentence_count
     
-    def _avg_word_length(self, text: str) -> float:
+    def _avg_word_length(self, words: List[str]) -> float:
         """Berechnet durchschnittliche Wortlänge."""
-        words = re.findall(r'\b\w+\b', text)
         if not words:
             return 0
-        return sum(len(word) for word in words) / len(words)
+        return sum(map(len, words)) / len(words)
     
-    def _count_special_terms(self, text: str) -> int:
-        """Zählt Fachbegriffe im Text."""
-        technical_terms = {
-            "abs", "esp", "asv", "tcs", "egr", "dpf", "scr", "obd",
-            "ecu", "can", "lin", "iso", "sae", "din", "ece", "etk"
-        }
-        return sum(1 for term in technical_terms if term.lower() in text.lower())
+    def _count_special_terms(self, words_set: Set[str]) -> int:
+        """Zählt die im Text vorkommenden Fachbegriffe (ganze Wörter)."""
+        return len(_TECHNICAL_TERMS & words_set)
     
     @log_function_call(logger)
     async def validate_metadata(
@@ -306,35 +406,19 @@ class MetadataManager:
         """
         try:
             # Pflichtfelder prüfen
-            required_fields = [
-                "created_at",
-                "content_length",
-                "language"
-            ]
-            
-            for field in required_fields:
+            for field in _REQUIRED_METADATA_FIELDS:
                 if field not in metadata:
                     return False, f"Pflichtfeld fehlt: {field}"
             
             # Typ-Validierung
-            type_checks = {
-                "created_at": str,
-                "content_length": int,
-                "language": str,
-                "topics": list,
-                "keywords": list
-            }
-            
-            for field, expected_type in type_checks.items():
-                if field in metadata and not isinstance(
-                    metadata[field],
-                    expected_type
-                ):
+            for field, expected_type in _METADATA_FIELD_TYPES:
+                value = metadata.get(field, _MISSING)
+                if value is not _MISSING and not isinstance(value, expected_type):
                     return False, f"Ungültiger Typ für {field}"
             
             # Wertebereiche prüfen
-            if "complexity_score" in metadata:
-                score = metadata["complexity_score"]
+            score = metadata.get("complexity_score", _MISSING)
+            if score is not _MISSING:
                 if not isinstance(score, (int, float)) or not 0 <= score <= 1:
                     return False, "Ungültiger complexity_score"
             
@@ -3,8 +3,15 @@ Retrieval-Service-Modul.
 Zentrale Komponente für Dokumenten-Retrieval und -Management.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from collections import OrderedDict
 from datetime import datetime
+import asyncio
+import hashlib
+import json
+import time
+
+import numpy as np
 
 from src.config.settings import settings
 from src.config.logging_config import (
@@ -15,8 +22,13 @@ from src.config.logging_config import (
 )
 from src.backend.models.document import Document
 from src.backend.interfaces.retrieval import RetrievalService, RetrievalServiceError
-from src.backend.services.embedding_service import EmbeddingService
-from src.backend.utils.database import ChromaDBManager
+from src.backend.services.embedding_service import EmbeddingService, EmbeddingBatcher
+from src.backend.utils.database import (
+    ChromaDBManager,
+    QueryBatcher,
+    restore_metadata_lists,
+    split_query_results
+)
 from .factories.document_factory import DocumentFactory
 from .managers.cache_manager import CacheManager
 from .managers.metadata_manager import MetadataManager
@@ -26,6 +38,10 @@ from .utils.validators import DocumentValidator
 # Logger für dieses Modul initialisieren
 logger = get_logger(__name__)
 
+# Grenzen des Suchergebnis-Caches
+SEARCH_CACHE_SIZE = 512
+SEARCH_CACHE_TTL = 300.0  # Sekunden
+
 class RetrievalServiceImpl(RetrievalService):
     """
     Implementierung des Retrieval-Services mit optimierter Struktur.
@@ -56,6 +72,11 @@ class RetrievalServiceImpl(RetrievalService):
         # Kernkomponenten
         self.embedding_service = embedding_service
         self.db = db_manager or ChromaDBManager()
+        self._query_embedder = EmbeddingBatcher(embedding_service)
+        self._query_batcher = QueryBatcher(self.db)
+        
+        # Suchergebnisse je (Schreibgeneration der Datenbank, Anfrage, Limit, Filter)
+        self._search_cache: OrderedDict[Tuple, Tuple[float, List[Document]]] = OrderedDict()
         
         # Hilfskomponenten initialisieren
         self.document_factory = DocumentFactory()
@@ -70,8 +91,11 @@ class RetrievalServiceImpl(RetrievalService):
         """Initialisiert den Service und seine Abhängigkeiten."""
         try:
             with log_execution_time(self.logger, "service_initialization"):
-                await self.embedding_service.initialize()
-                await self.db.initialize()
+                # Unabhängige Abhängigkeiten parallel initialisieren
+                await asyncio.gather(
+                    self.embedding_service.initialize(),
+                    self.db.initialize()
+                )
                 
             self.logger.info("Retrieval-Service initialisiert")
             
@@ -89,11 +113,20 @@ class RetrievalServiceImpl(RetrievalService):
         """Bereinigt Service-Ressourcen."""
         try:
             with log_execution_time(self.logger, "service_cleanup"):
-                await self.embedding_service.cleanup()
-                await self.db.cleanup()
-                await self.cache_manager.clear()
+                # Alle Komponenten bereinigen, auch wenn eine davon fehlschlägt
+                results = await asyncio.gather(
+                    self.embedding_service.cleanup(),
+                    self.db.cleanup(),
+                    self.cache_manager.clear(),
+                    return_exceptions=True
+                )
             
-            self.logger.info("Service-Ressourcen bereinigt")
+            errors = [result for result in results if isinstance(result, Exception)]
+            for error in errors:
+                self.logger.error(f"Fehler bei Ressourcenbereinigung: {str(error)}")
+            
+            if not errors:
+                self.logger.info("Service-Ressourcen bereinigt")
             
         except Exception as e:
             self.logger.error(f"Fehler bei Ressourcenbereinigung: {str(e)}")
@@ -113,13 +146,13 @@ class RetrievalServiceImpl(RetrievalService):
             RetrievalServiceError: Bei Fehlern beim Hinzufügen
         """
         try:
-            # Metadaten extrahieren und hinzufügen
-            metadata = await self.metadata_manager.extract_metadata(document.content)
+            # Metadaten und Embedding unabhängig voneinander parallel erzeugen
+            metadata, embedding = await asyncio.gather(
+                self.metadata_manager.extract_metadata(document.content),
+                self.embedding_service.get_embedding(document.content)
+            )
             document.metadata.update(metadata)
             
-            # Embedding generieren
-            embedding = await self.embedding_service.get_embedding(document.content)
-            
             # In ChromaDB speichern
             await self.db.add_documents(
                 ids=[document.id],
@@ -130,6 +163,7 @@ class RetrievalServiceImpl(RetrievalService):
             
             # Im Cache speichern
             await self.cache_manager.put(document)
+            self._invalidate_search_cache()
             
             self.logger.info(
                 "Dokument hinzugefügt",
@@ -153,6 +187,97 @@ class RetrievalServiceImpl(RetrievalService):
             )
             raise RetrievalServiceError(f"Dokument konnte nicht hinzugefügt werden: {str(e)}")
     
+    @log_function_call(logger)
+    async def add_documents(self, documents: List[Document]) -> List[Document]:
+        """
+        Fügt mehrere Dokumente in Batches zum System hinzu.
+        
+        Metadaten werden parallel extrahiert, Embeddings je Batch in einem
+        Aufruf generiert und jeder Batch mit einem Insert gespeichert. Die
+        Embeddings des nächsten Batches werden bereits während des
+        Schreibens des aktuellen Batches erzeugt.
+        
+        Args:
+            documents: Hinzuzufügende Dokumente
+        
+        Returns:
+            Liste der verarbeiteten Dokumente
+        
+        Raises:
+            RetrievalServiceError: Bei Fehlern beim Hinzufügen
+        """
+        if not documents:
+            return []
+        
+        batch_size = settings.database.batch_size
+        batches = [
+            documents[start:start + batch_size]
+            for start in range(0, len(documents), batch_size)
+        ]
+        pending_embeddings = None
+        
+        try:
+            # Embeddings des ersten Batches parallel zur Metadatenextraktion starten
+            pending_embeddings = asyncio.create_task(
+                self.embedding_service.get_embeddings(
+                    [document.content for document in batches[0]]
+                )
+            )
+            metadata_list = await asyncio.gather(*(
+                self.metadata_manager.extract_metadata(document.content)
+                for document in documents
+            ))
+            for document, metadata in zip(documents, metadata_list):
+                document.metadata.update(metadata)
+            
+            for index, batch in enumerate(batches):
+                embeddings = await pending_embeddings
+                
+                # Nächsten Batch vorberechnen, während dieser geschrieben wird
+                if index + 1 < len(batches):
+                    pending_embeddings = asyncio.create_task(
+                        self.embedding_service.get_embeddings(
+                            [document.content for document in batches[index + 1]]
+                        )
+                    )
+                
+                # In ChromaDB speichern
+                await self.db.add_documents(
+                    ids=[document.id for document in batch],
+                    embeddings=embeddings,
+                    documents=[document.content for document in batch],
+                    metadatas=[document.metadata for document in batch]
+                )
+                
+                # Erst nach erfolgreichem Schreiben cachen
+                await self.cache_manager.put_many(batch)
+                self._invalidate_search_cache()
+            
+            self.logger.info(
+                "Dokumente hinzugefügt",
+                extra={
+                    "document_count": len(documents),
+                    "batch_count": len(batches),
+                    "total_length": sum(len(document.content) for document in documents)
+                }
+            )
+            return documents
+        
+        except Exception as e:
+            if pending_embeddings is not None and not pending_embeddings.done():
+                pending_embeddings.cancel()
+            error_context = {
+                "document_count": len(documents),
+                "first_id": documents[0].id
+            }
+            log_error_with_context(
+                self.logger,
+                e,
+                error_context,
+                "Fehler beim Hinzufügen mehrerer Dokumente"
+            )
+            raise RetrievalServiceError(f"Dokumente konnten nicht hinzugefügt werden: {str(e)}")
+    
     @log_function_call(logger)
     async def get_document(self, document_id: str) -> Optional[Document]:
         """
@@ -169,19 +294,33 @@ class RetrievalServiceImpl(RetrievalService):
             if cached_doc := await self.cache_manager.get(document_id):
                 return cached_doc
             
-            # Aus Datenbank abrufen
-            results = await self.db.query(
-                query_embeddings=[],
-                where={"original_id": document_id}
-            )
+            # Direkt über die ID bzw. den ersten Chunk abrufen
+            first_chunk_id = f"{document_id}_chunk_0"
+            results = await self.db.get_by_ids([document_id, first_chunk_id])
+            found_ids = results["ids"][0]
             
-            if not results or not results.get('documents'):
+            if not found_ids:
                 self.logger.warning(
                     "Dokument nicht gefunden",
                     extra={"document_id": document_id}
                 )
                 return None
             
+            if document_id not in found_ids:
+                # Gechunktes Dokument: alle Chunk-IDs sind aus total_chunks bekannt
+                total_chunks = results["metadatas"][0][0].get("total_chunks", 1)
+                if total_chunks > 1:
+                    results = await self.db.get_by_ids([
+                        f"{document_id}_chunk_{i}" for i in range(total_chunks)
+                    ])
+            elif len(found_ids) > 1:
+                # Ungechunktes Dokument hat Vorrang
+                index = found_ids.index(document_id)
+                results = {
+                    key: [[results[key][0][index]]]
+                    for key in ("ids", "documents", "metadatas")
+                }
+            
             # Dokument rekonstruieren
             document = await self.result_processor.process_chunk_results(
                 results,
@@ -208,7 +347,8 @@ class RetrievalServiceImpl(RetrievalService):
         self,
         query: str,
         limit: int = 3,
-        metadata_filter: Optional[Dict[str, Any]] = None
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        strategy: str = "pre"
     ) -> List[Document]:
         """
         Sucht nach Dokumenten.
@@ -217,26 +357,42 @@ class RetrievalServiceImpl(RetrievalService):
             query: Suchanfrage
             limit: Maximale Anzahl Ergebnisse
             metadata_filter: Optionaler Metadaten-Filter
+            strategy: "pre" filtert in ChromaDB vor der Vektorsuche, "post"
+                filtert überabgetastete Treffer danach (für wenig selektive Filter)
             
         Returns:
             Liste gefundener Dokumente
         """
         try:
-            # Embedding für Suchanfrage generieren
-            query_embedding = await self.embedding_service.get_embedding(query)
+            if strategy not in ("pre", "post"):
+                raise ValueError(f"Unbekannte Filterstrategie: {strategy}")
+            
+            cache_key = self._search_cache_key(query, limit, metadata_filter, strategy)
+            cached = self._search_cache.get(cache_key)
+            if cached is not None:
+                expires_at, documents = cached
+                if expires_at > time.monotonic():
+                    self._search_cache.move_to_end(cache_key)
+                    return self._copy_documents(documents)
+                del self._search_cache[cache_key]
+            
+            # Embedding für Suchanfrage generieren (gebündelt mit parallelen Anfragen)
+            query_embedding = await self._query_embedder.get_embedding(query)
             
             # Suche durchführen
-            results = await self.db.query(
-                query_embeddings=[query_embedding],
-                n_results=limit,
-                where=metadata_filter
+            documents = await self._query_by_embedding(
+                query_embedding,
+                limit,
+                metadata_filter,
+                post_filter=strategy == "post"
             )
             
-            # Ergebnisse verarbeiten
-            documents = await self.result_processor.process_search_results(
-                results,
-                include_scores=True
+            self._search_cache[cache_key] = (
+                time.monotonic() + SEARCH_CACHE_TTL,
+                self._copy_documents(documents)
             )
+            while len(self._search_cache) > SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
             
             self.logger.info(
                 "Dokumentensuche durchgeführt",
@@ -260,6 +416,165 @@ class RetrievalServiceImpl(RetrievalService):
             )
             raise RetrievalServiceError(f"Suche fehlgeschlagen: {str(e)}")
     
+    def _search_cache_key(
+        self,
+        query: str,
+        limit: int,
+        metadata_filter: Optional[Dict[str, Any]],
+        strategy: str
+    ) -> Tuple:
+        """
+        Bildet den Cache-Schlüssel einer Suchanfrage.
+        
+        Die Schreibgeneration der Datenbank ist Teil des Schlüssels. Sie wird
+        von jedem Manager auf demselben Persistenz-Verzeichnis erhöht, sodass
+        auch Uploads über andere Manager (z.B. die Dokumentenseite) ältere
+        Ergebnisse und die Ergebnisse laufender Suchen entwerten.
+        """
+        return (
+            self.db.write_generation,
+            hashlib.blake2b(query.encode("utf-8"), digest_size=16).digest(),
+            limit,
+            json.dumps(metadata_filter, sort_keys=True, default=str)
+            if metadata_filter else None,
+            strategy
+        )
+    
+    def _invalidate_search_cache(self) -> None:
+        """Verwirft alle gecachten Suchergebnisse nach Änderungen am Bestand."""
+        self._search_cache.clear()
+    
+    @staticmethod
+    def _copy_documents(documents: List[Document]) -> List[Document]:
+        """Kopiert Dokumente tief, damit Aufrufer den Cache nicht verändern."""
+        return [document.model_copy(deep=True) for document in documents]
+    
+    @log_function_call(logger)
+    async def search_documents_batch(
+        self,
+        queries: List[str],
+        limit: int = 3,
+        metadata_filter: Optional[Dict[str, Any]] = None
+    ) -> List[List[Document]]:
+        """
+        Sucht für mehrere Anfragen gleichzeitig nach Dokumenten.
+        
+        Alle Anfragen werden mit einem Embedding-Aufruf eingebettet und mit
+        einer einzigen Multi-Query durchsucht.
+        
+        Args:
+            queries: Suchanfragen
+            limit: Maximale Anzahl Ergebnisse je Anfrage
+            metadata_filter: Optionaler Metadaten-Filter für alle Anfragen
+            
+        Returns:
+            Liste gefundener Dokumente je Anfrage, in Anfragereihenfolge
+        """
+        if not queries:
+            return []
+        
+        try:
+            embeddings = await self.embedding_service.get_embeddings(queries)
+            results = await self.db.query(
+                query_embeddings=embeddings,
+                n_results=limit,
+                where=metadata_filter
+            )
+            
+            documents = await asyncio.gather(*(
+                self.result_processor.process_search_results(
+                    row_results,
+                    include_scores=True
+                )
+                for row_results in split_query_results(results)
+            ))
+            
+            self.logger.info(
+                "Batch-Dokumentensuche durchgeführt",
+                extra={
+                    "query_count": len(queries),
+                    "results_count": sum(len(docs) for docs in documents)
+                }
+            )
+            return list(documents)
+            
+        except Exception as e:
+            error_context = {
+                "query_count": len(queries),
+                "limit": limit
+            }
+            log_error_with_context(
+                self.logger,
+                e,
+                error_context,
+                "Fehler bei der Batch-Dokumentensuche"
+            )
+            raise RetrievalServiceError(f"Batch-Suche fehlgeschlagen: {str(e)}")
+    
+    @log_function_call(logger)
+    async def search_by_embedding(
+        self,
+        embedding: List[float],
+        limit: int = 5,
+        metadata_filter: Optional[Dict[str, Any]] = None
+    ) -> List[Document]:
+        """
+        Sucht nach Dokumenten anhand eines vorhandenen Embeddings.
+        
+        Args:
+            embedding: Embedding-Vektor der Anfrage
+            limit: Maximale Anzahl Ergebnisse
+            metadata_filter: Optionaler Metadaten-Filter
+            
+        Returns:
+            Liste gefundener Dokumente
+        """
+        try:
+            documents = await self._query_by_embedding(
+                embedding,
+                limit,
+                metadata_filter
+            )
+            
+            self.logger.info(
+                "Embedding-Suche durchgeführt",
+                extra={"results_count": len(documents)}
+            )
+            return documents
+            
+        except Exception as e:
+            error_context = {
+                "embedding_size": len(embedding),
+                "limit": limit
+            }
+            log_error_with_context(
+                self.logger,
+                e,
+                error_context,
+                "Fehler bei der Embedding-Suche"
+            )
+            raise RetrievalServiceError(f"Embedding-Suche fehlgeschlagen: {str(e)}")
+    
+    async def _query_by_embedding(
+        self,
+        embedding: List[float],
+        limit: int,
+        metadata_filter: Optional[Dict[str, Any]],
+        post_filter: bool = False
+    ) -> List[Document]:
+        """Führt die Vektorsuche aus und verarbeitet die Ergebnisse."""
+        # Gleichzeitige Suchen werden zu einer Multi-Query gebündelt
+        results = await self._query_batcher.query(
+            embedding,
+            n_results=limit,
+            where=metadata_filter,
+            post_filter=post_filter
+        )
+        return await self.result_processor.process_search_results(
+            results,
+            include_scores=True
+        )
+    
     @log_function_call(logger)
     async def delete_document(self, document_id: str) -> bool:
         """
@@ -272,15 +587,26 @@ class RetrievalServiceImpl(RetrievalService):
             True wenn erfolgreich gelöscht
         """
         try:
-            document = await self.get_document(document_id)
-            if not document:
-                return False
+            # Leichte Existenzprüfung statt vollständiger Dokumentrekonstruktion
+            if await self.db.exists(document_id):
+                ids = [document_id]
+            else:
+                # Gechunktes Dokument: Chunk-IDs aus total_chunks ableiten
+                first_chunk = await self.db.get_metadata(f"{document_id}_chunk_0")
+                if first_chunk is None:
+                    await self.cache_manager.remove(document_id)
+                    return False
+                ids = [
+                    f"{document_id}_chunk_{i}"
+                    for i in range(first_chunk.get("total_chunks", 1))
+                ]
             
             # Aus der Datenbank löschen
-            await self.db.delete([document_id])
+            await self.db.delete(ids)
             
             # Aus dem Cache entfernen
             await self.cache_manager.remove(document_id)
+            self._invalidate_search_cache()
             
             self.logger.info(
                 "Dokument gelöscht",
@@ -315,11 +641,53 @@ class RetrievalServiceImpl(RetrievalService):
             Aktualisiertes Dokument oder None
         """
         try:
-            # Altes Dokument löschen
-            await self.delete_document(document_id)
+            # Eintrag unter der ID und ersten Chunk in einem Abruf lesen
+            first_chunk_id = f"{document_id}_chunk_0"
+            results = await self.db.get_by_ids([document_id, first_chunk_id])
+            stored = dict(zip(
+                results["ids"][0],
+                zip(results["documents"][0], results["metadatas"][0])
+            ))
+            
+            if document_id not in stored:
+                if first_chunk_id not in stored:
+                    self.logger.warning(
+                        "Zu aktualisierendes Dokument nicht gefunden",
+                        extra={"document_id": document_id}
+                    )
+                    return None
+                
+                document.id = document_id
+                return await self._update_chunked_document(
+                    document,
+                    stored[first_chunk_id][1] or {}
+                )
             
-            # Neues Dokument hinzufügen
-            updated_doc = await self.add_document(document)
+            # Bei unverändertem Inhalt gespeichertes Embedding wiederverwenden;
+            # der Textvergleich gilt auch für Einträge ohne content_hash
+            content_unchanged = stored[document_id][0] == document.content
+            metadata, embedding = await asyncio.gather(
+                self.metadata_manager.extract_metadata(document.content),
+                self.db.get_embedding(document_id)
+                if content_unchanged
+                else self.embedding_service.get_embedding(document.content)
+            )
+            if embedding is None:
+                embedding = await self.embedding_service.get_embedding(document.content)
+            document.metadata.update(metadata)
+            document.id = document_id
+            
+            # Eintrag in ChromaDB direkt aktualisieren statt löschen + neu anlegen
+            await self.db.update(
+                id=document_id,
+                embedding=embedding,
+                document=document.content,
+                metadata=document.metadata
+            )
+            
+            # Cache aktualisieren
+            await self.cache_manager.put(document)
+            self._invalidate_search_cache()
             
             self.logger.info(
                 "Dokument aktualisiert",
@@ -328,7 +696,7 @@ class RetrievalServiceImpl(RetrievalService):
                     "content_length": len(document.content)
                 }
             )
-            return updated_doc
+            return document
             
         except Exception as e:
             error_context = {
@@ -343,6 +711,68 @@ class RetrievalServiceImpl(RetrievalService):
             )
             raise RetrievalServiceError(f"Aktualisierung fehlgeschlagen: {str(e)}")
     
+    async def _update_chunked_document(
+        self,
+        document: Document,
+        first_chunk_metadata: Dict[str, Any]
+    ) -> Document:
+        """
+        Aktualisiert ein gechunktes Dokument.
+        
+        Bei unverändertem Inhalt werden nur die geänderten Metadaten in alle
+        Chunks übernommen, Chunk-Texte und Embeddings bleiben erhalten.
+        Sonst werden die Chunks gelöscht und das Dokument neu angelegt.
+        
+        Args:
+            document: Neues Dokument mit bereits gesetzter ID
+            first_chunk_metadata: Gespeicherte Metadaten des ersten Chunks
+            
+        Returns:
+            Aktualisiertes Dokument
+        """
+        chunk_ids = [
+            f"{document.id}_chunk_{i}"
+            for i in range(first_chunk_metadata.get("total_chunks", 1))
+        ]
+        results = await self.db.get_by_ids(chunk_ids)
+        chunks = sorted(
+            zip(results["ids"][0], results["documents"][0], results["metadatas"][0]),
+            key=lambda chunk: (chunk[2] or {}).get("chunk_index", 0)
+        )
+        
+        if " ".join(content for _, content, _ in chunks) == document.content:
+            # Nur gegenüber dem ersten Chunk geänderte Metadaten übernehmen
+            stored_metadata = restore_metadata_lists(first_chunk_metadata)
+            changes = {
+                key: value
+                for key, value in document.metadata.items()
+                if key not in ("original_id", "chunk_index", "total_chunks")
+                and stored_metadata.get(key) != value
+            }
+            if changes:
+                await self.db.update_metadatas(
+                    ids=[chunk_id for chunk_id, _, _ in chunks],
+                    metadatas=[{**(metadata or {}), **changes} for _, _, metadata in chunks]
+                )
+            await self.cache_manager.remove(document.id)
+            self._invalidate_search_cache()
+            
+            self.logger.info(
+                "Gechunktes Dokument aktualisiert",
+                extra={
+                    "document_id": document.id,
+                    "chunk_count": len(chunks),
+                    "changed_keys": list(changes)
+                }
+            )
+            return document
+        
+        # Geänderter Inhalt: Chunks löschen und Dokument neu anlegen
+        await self.db.delete(chunk_ids)
+        await self.cache_manager.remove(document.id)
+        self._invalidate_search_cache()
+        return await self.add_document(document)
+    
     @log_function_call(logger)
     async def get_similar_documents(
         self,
@@ -362,20 +792,29 @@ class RetrievalServiceImpl(RetrievalService):
             Liste ähnlicher Dokumente
         """
         try:
-            document = await self.get_document(document_id)
-            if not document:
-                return []
+            # Gespeichertes Embedding wiederverwenden statt neu zu berechnen
+            embedding = await self.db.get_embedding(document_id)
+            if embedding is None:
+                embedding = await self._chunk_centroid(document_id)
+            if embedding is None:
+                document = await self.get_document(document_id)
+                if not document:
+                    return []
+                embedding = await self.embedding_service.get_embedding(
+                    document.content
+                )
             
             # Ähnlichkeitssuche durchführen
-            similar_docs = await self.search_documents(
-                query=document.content,
+            similar_docs = await self.search_by_embedding(
+                embedding,
                 limit=limit + 1  # +1 für das Dokument selbst
             )
             
-            # Originaldokument ausfiltern
+            # Originaldokument und seine Chunks ausfiltern
             filtered_docs = [
                 doc for doc in similar_docs 
                 if doc.id != document_id
+                and doc.metadata.get("original_id") != document_id
             ]
             
             # Score-Filter anwenden
@@ -405,4 +844,32 @@ class RetrievalServiceImpl(RetrievalService):
                 error_context,
                 "Fehler bei Ähnlichkeitssuche"
             )
-            raise RetrievalServiceError(f"Ähnlichkeitssuche fehlgeschlagen: {str(e)}")
\ No newline at end of file
+            raise RetrievalServiceError(f"Ähnlichkeitssuche fehlgeschlagen: {str(e)}")
+    
+    async def _chunk_centroid(self, document_id: str) -> Optional[np.ndarray]:
+        """
+        Bildet das normierte Mittel der gespeicherten Chunk-Embeddings.
+        
+        Gechunkte Dokumente haben kein eigenes Embedding; der Zentroid ihrer
+        Chunks ersetzt das erneute Einbetten des gesamten Inhalts.
+        
+        Args:
+            document_id: ID des Originaldokuments
+        
+        Returns:
+            Zentroid als float32-Array oder None falls keine Chunks existieren
+        """
+        first_chunk = await self.db.get_metadata(f"{document_id}_chunk_0")
+        if first_chunk is None:
+            return None
+        
+        total_chunks = first_chunk.get("total_chunks", 1)
+        embeddings = await self.db.get_embeddings([
+            f"{document_id}_chunk_{i}" for i in range(total_chunks)
+        ])
+        if embeddings is None:
+            return None
+        
+        centroid = embeddings.mean(axis=0)
+        norm = np.linalg.norm(centroid)
+        return centroid / norm if norm > 0 else centroid
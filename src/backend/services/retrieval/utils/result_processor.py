@@ -3,8 +3,11 @@ Result Processor Modul.
 Verantwortlich für die Verarbeitung und Aufbereitung von Suchergebnissen.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, NamedTuple
 from datetime import datetime
+from operator import itemgetter
+
+import numpy as np
 
 from src.config.settings import settings
 from src.config.logging_config import (
@@ -15,11 +18,31 @@ from src.config.logging_config import (
 )
 from src.backend.models.document import Document, DocumentType, DocumentStatus
 from src.backend.interfaces.base import ServiceError
-from .validators import DocumentValidator
+from src.backend.utils.database import restore_metadata_lists
+from .validators import DocumentValidator, parse_iso_datetime
 
 # Logger für dieses Modul initialisieren
 logger = get_logger(__name__)
 
+# Vorberechnete Enum-Lookups mit Standardwerten
+_DOCUMENT_TYPES = {member.value: member for member in DocumentType}
+_DOCUMENT_STATUSES = {member.value: member for member in DocumentStatus}
+_DEFAULT_DOCUMENT_TYPE = DocumentType.SONSTIGES
+_DEFAULT_DOCUMENT_STATUS = DocumentStatus.COMPLETED
+
+# Ab dieser Chunk-Anzahl wird per NumPy statt in Python sortiert
+_NUMPY_SORT_THRESHOLD = 1024
+
+# Chunk-spezifische Metadaten, die nicht ins rekonstruierte Dokument gehören
+_CHUNK_METADATA_KEYS = frozenset({"chunk_index", "total_chunks", "original_id"})
+
+class _Chunk(NamedTuple):
+    """Einzelner Chunk eines Dokuments aus einem Suchergebnis."""
+    id: str
+    content: str
+    metadata: Dict[str, Any]
+    index: int
+
 class ResultProcessorError(ServiceError):
     """Spezifische Exception für Fehler bei der Ergebnisverarbeitung."""
     pass
@@ -72,31 +95,42 @@ class ResultProcessor:
                 if not self._validate_results_structure(results):
                     raise ResultProcessorError("Ungültiges Ergebnisformat")
                 
-                # Ergebnislisten extrahieren
-                documents = []
-                for i, (doc_id, content, metadata) in enumerate(zip(
-                    results["ids"][0],
-                    results["documents"][0],
-                    results["metadatas"][0]
-                )):
-                    # Score prüfen falls vorhanden
-                    if min_score is not None and include_scores:
-                        if (
-                            "distances" in results and
-                            results["distances"][0][i] > min_score
-                        ):
-                            continue
-                    
+                # Ergebnislisten einmalig extrahieren
+                ids = results["ids"][0]
+                contents = results["documents"][0]
+                metadatas = results["metadatas"][0]
+                distances = results.get("distances")
+                has_distances = bool(distances)
+                if include_scores and has_distances:
+                    scores = distances[0]
+                else:
+                    scores = [None] * len(ids)
+                
+                # Score-Filter vektorisiert vorab berechnen
+                if min_score is not None and include_scores and has_distances:
+                    keep = ~(np.asarray(scores, dtype=np.float64) > min_score)
+                    rows = (
+                        (ids[i], contents[i], metadatas[i], scores[i])
+                        for i in np.flatnonzero(keep).tolist()
+                    )
+                else:
+                    rows = zip(ids, contents, metadatas, scores)
+                
+                # Ergebnisliste vorab dimensionieren
+                documents = [None] * len(ids)
+                valid_count = 0
+                for doc_id, content, metadata, score in rows:
                     # Dokument erstellen
                     try:
                         doc = await self._create_document_from_result(
                             doc_id,
                             content,
                             metadata,
-                            results.get("distances", [[]])[0][i] if include_scores else None
+                            score
                         )
-                        if doc and await self.validator.validate(doc):
-                            documents.append(doc)
+                        if doc and self.validator.validate(doc):
+                            documents[valid_count] = doc
+                            valid_count += 1
                     except Exception as e:
                         self.logger.warning(
                             f"Fehler bei Dokumenterstellung: {str(e)}",
@@ -104,6 +138,9 @@ class ResultProcessor:
                         )
                         continue
                 
+                # Ungenutzte Plätze entfernen
+                del documents[valid_count:]
+                
                 self.logger.info(
                     "Suchergebnisse verarbeitet",
                     extra={
@@ -151,47 +188,73 @@ class ResultProcessor:
                     raise ResultProcessorError("Ungültige Chunk-Ergebnisse")
                 
                 # Chunks nach Index sortieren
-                chunks = []
+                chunks = [None] * len(results["ids"][0])
                 for i, (doc_id, content, metadata) in enumerate(zip(
                     results["ids"][0],
                     results["documents"][0],
                     results["metadatas"][0]
                 )):
-                    chunks.append({
-                        "id": doc_id,
-                        "content": content,
-                        "metadata": metadata,
-                        "index": metadata.get("chunk_index", i)
-                    })
+                    chunks[i] = _Chunk(
+                        doc_id,
+                        content,
+                        metadata,
+                        metadata.get("chunk_index", i)
+                    )
                 
-                chunks.sort(key=lambda x: x["index"])
+                if len(chunks) >= _NUMPY_SORT_THRESHOLD:
+                    # Große Ergebnismengen: stabiles argsort über die Indizes
+                    chunk_indices = np.fromiter(
+                        (chunk.index for chunk in chunks),
+                        dtype=np.int64,
+                        count=len(chunks)
+                    )
+                    order = np.argsort(chunk_indices, kind="stable")
+                    chunks = [chunks[k] for k in order.tolist()]
+                else:
+                    chunks.sort(key=itemgetter(3))  # _Chunk.index
                 
                 # Dokumentdaten extrahieren
-                base_metadata = chunks[0]["metadata"].copy()
-                for key in ["chunk_index", "total_chunks", "original_id"]:
-                    base_metadata.pop(key, None)
+                base_metadata = restore_metadata_lists({
+                    key: value
+                    for key, value in chunks[0].metadata.items()
+                    if key not in _CHUNK_METADATA_KEYS
+                })
                 
                 # Inhalte zusammenführen
-                combined_content = " ".join(chunk["content"] for chunk in chunks)
+                combined_content = " ".join([chunk.content for chunk in chunks])
                 
                 # Dokument erstellen
+                get = base_metadata.get
+                title = get("title")
+                if title is None:
+                    title = f"Dokument {original_id[:8]}"
+                source_link = get("source_link")
+                if source_link is None:
+                    source_link = f"https://default-source/{original_id}"
+                created_at = get("created_at")
                 document = Document(
                     id=original_id,
-                    title=base_metadata.get("title", f"Dokument {original_id[:8]}"),
+                    title=title,
                     content=combined_content,
-                    source_link=base_metadata.get("source_link", f"https://default-source/{original_id}"),
-                    document_type=DocumentType(base_metadata.get("document_type", "sonstiges")),
-                    status=DocumentStatus(base_metadata.get("status", "completed")),
+                    source_link=source_link,
+                    document_type=_DOCUMENT_TYPES.get(
+                        get("document_type"),
+                        _DEFAULT_DOCUMENT_TYPE
+                    ),
+                    status=_DOCUMENT_STATUSES.get(
+                        get("status"),
+                        _DEFAULT_DOCUMENT_STATUS
+                    ),
                     metadata=base_metadata,
-                    created_at=datetime.fromisoformat(base_metadata.get(
-                        "created_at",
-                        datetime.utcnow().isoformat()
-                    )),
-                    language=base_metadata.get("language", "de"),
-                    topics=base_metadata.get("topics", [])
+                    created_at=(
+                        parse_iso_datetime(created_at)
+                        if created_at else datetime.utcnow()
+                    ),
+                    language=get("language", "de"),
+                    topics=get("topics") or []
                 )
                 
-                if not await self.validator.validate(document):
+                if not self.validator.validate(document):
                     raise ResultProcessorError("Rekonstruiertes Dokument ungültig")
                 
                 self.logger.info(
@@ -241,26 +304,42 @@ class ResultProcessor:
             # Metadaten validieren und standardisieren
             if not isinstance(metadata, dict):
                 metadata = {}
+            else:
+                metadata = restore_metadata_lists(metadata)
             
             # Score hinzufügen falls vorhanden
             if score is not None:
                 metadata["search_score"] = score
             
             # Dokument erstellen
+            get = metadata.get
+            title = get("title")
+            if title is None:
+                title = f"Dokument {doc_id[:8]}"
+            source_link = get("source_link")
+            if source_link is None:
+                source_link = f"https://default-source/{doc_id}"
+            created_at = get("created_at")
             document = Document(
                 id=doc_id,
-                title=metadata.get("title", f"Dokument {doc_id[:8]}"),
+                title=title,
                 content=content,
-                source_link=metadata.get("source_link", f"https://default-source/{doc_id}"),
-                document_type=DocumentType(metadata.get("document_type", "sonstiges")),
-                status=DocumentStatus(metadata.get("status", "completed")),
+                source_link=source_link,
+                document_type=_DOCUMENT_TYPES.get(
+                    get("document_type"),
+                    _DEFAULT_DOCUMENT_TYPE
+                ),
+                status=_DOCUMENT_STATUSES.get(
+                    get("status"),
+                    _DEFAULT_DOCUMENT_STATUS
+                ),
                 metadata=metadata,
-                created_at=datetime.fromisoformat(metadata.get(
-                    "created_at",
-                    datetime.utcnow().isoformat()
-                )),
-                language=metadata.get("language", "de"),
-                topics=metadata.get("topics", [])
+                created_at=(
+                    parse_iso_datetime(created_at)
+                    if created_at else datetime.utcnow()
+                ),
+                language=get("language", "de"),
+                topics=get("topics") or []
             )
             
             return document
@@ -282,21 +361,18 @@ class ResultProcessor:
         Returns:
             True wenn Struktur gültig
         """
-        required_keys = ["ids", "documents", "metadatas"]
-        if not all(key in results for key in required_keys):
-            return False
-        
-        # Prüfen ob Listen vorhanden und nicht leer
-        if not all(isinstance(results[key], list) for key in required_keys):
-            return False
-        
-        # Prüfen ob innere Listen vorhanden
-        if not all(isinstance(results[key][0], list) for key in required_keys):
-            return False
-        
-        # Prüfen ob alle Listen gleich lang sind
-        lengths = [len(results[key][0]) for key in required_keys]
-        if not all(length == lengths[0] for length in lengths):
-            return False
+        expected_length = None
+        for key in ("ids", "documents", "metadatas"):
+            value = results.get(key)
+            
+            # Äußere und innere Liste müssen vorhanden sein
+            if not isinstance(value, list) or not value or not isinstance(value[0], list):
+                return False
+            
+            # Alle inneren Listen müssen gleich lang sein
+            if expected_length is None:
+                expected_length = len(value[0])
+            elif len(value[0]) != expected_length:
+                return False
         
-        return True
\ No newline at end of file
+        return True
@@ -5,8 +5,9 @@ Stellt Validierungslogik für Dokumente und verwandte Datenstrukturen bereit.
 
 from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
+from functools import lru_cache
+import logging
 import re
-from urllib.parse import urlparse
 
 from src.config.settings import settings
 from src.config.logging_config import (
@@ -21,6 +22,23 @@ from src.backend.interfaces.base import ServiceError
 # Logger für dieses Modul initialisieren
 logger = get_logger(__name__)
 
+# Markierung für fehlende Dictionary-Einträge
+_MISSING = object()
+
+@lru_cache(maxsize=1024)
+def parse_iso_datetime(value: str) -> datetime:
+    """
+    Parst einen ISO-Zeitstempel mit Memoisierung.
+    
+    Validierung und Dokumenterstellung parsen denselben created_at-Wert;
+    der zweite Aufruf wird aus dem Cache bedient.
+    
+    Raises:
+        ValueError: Bei ungültigem Format
+        TypeError: Bei falschem oder nicht hashbarem Typ
+    """
+    return datetime.fromisoformat(value)
+
 class ValidationError(ServiceError):
     """Spezifische Exception für Validierungsfehler."""
     pass
@@ -37,6 +55,17 @@ class DocumentValidator:
     - Format- und Typprüfungen
     """
     
+    # Minimale und maximale Längen
+    MIN_TITLE_LENGTH = 3
+    MAX_TITLE_LENGTH = 200
+    MIN_CONTENT_LENGTH = 10
+    MAX_CONTENT_LENGTH = 1_000_000  # 1MB
+    
+    # Regex-Patterns
+    VALID_ID_PATTERN = re.compile(r'^[a-zA-Z0-9_-]+$')
+    VALID_LANGUAGE_PATTERN = re.compile(r'^[a-z]{2}(-[A-Z]{2})?$')
+    VALID_URL_PATTERN = re.compile(r'^[a-zA-Z][a-zA-Z0-9+\-.]*://[^\s/]+')
+    
     def __init__(self, strict_mode: bool = False):
         """
         Initialisiert den Document Validator.
@@ -46,22 +75,13 @@ class DocumentValidator:
         """
         self.strict_mode = strict_mode
         self.logger = get_logger(f"{__name__}.{self.__class__.__name__}")
-        
-        # Minimale und maximale Längen
-        self.MIN_TITLE_LENGTH = 3
-        self.MAX_TITLE_LENGTH = 200
-        self.MIN_CONTENT_LENGTH = 10
-        self.MAX_CONTENT_LENGTH = 1_000_000  # 1MB
-        
-        # Regex-Patterns
-        self.VALID_ID_PATTERN = re.compile(r'^[a-zA-Z0-9_-]+$')
-        self.VALID_LANGUAGE_PATTERN = re.compile(r'^[a-z]{2}(-[A-Z]{2})?$')
     
-    @log_function_call(logger)
-    async def validate(self, document: Document) -> bool:
+    def validate(self, document: Document) -> bool:
         """
         Führt eine vollständige Validierung eines Dokuments durch.
         
+        Die Prüfungen brechen beim ersten Fehler ab.
+        
         Args:
             document: Zu validierendes Dokument
             
@@ -72,29 +92,11 @@ class DocumentValidator:
             Loggt Validierungsfehler aber wirft keine Exceptions
         """
         try:
-            with log_execution_time(self.logger, "document_validation"):
-                # Basis-Validierungen
-                validations = [
-                    self._validate_id(document.id),
-                    self._validate_title(document.title),
-                    self._validate_content(document.content),
-                    self._validate_source_link(document.source_link),
-                    await self._validate_metadata(document.metadata),
-                    self._validate_language(document.language),
-                    self._validate_status(document.status)
-                ]
-                
-                # Zusätzliche strikte Validierungen
-                if self.strict_mode:
-                    validations.extend([
-                        self._validate_topics(document.topics),
-                        self._validate_scores(document)
-                    ])
+            if self.logger.isEnabledFor(logging.DEBUG):
+                with log_execution_time(self.logger, "document_validation"):
+                    is_valid = self._run_validations(document)
                 
-                # Alle Validierungen prüfen
-                is_valid = all(validations)
-                
-                self.logger.info(
+                self.logger.debug(
                     f"Dokument {'erfolgreich' if is_valid else 'nicht'} validiert",
                     extra={
                         "document_id": document.id,
@@ -102,9 +104,10 @@ class DocumentValidator:
                         "valid": is_valid
                     }
                 )
-                
                 return is_valid
-                
+            
+            return self._run_validations(document)
+            
         except Exception as e:
             self.logger.error(
                 f"Fehler bei Dokumentvalidierung: {str(e)}",
@@ -112,6 +115,27 @@ class DocumentValidator:
             )
             return False
     
+    def _run_validations(self, document: Document) -> bool:
+        """Führt alle Einzelprüfungen mit frühem Abbruch aus."""
+        is_valid = (
+            self._validate_id(document.id)
+            and self._validate_title(document.title)
+            and self._validate_content(document.content)
+            and self._validate_source_link(document.source_link)
+            and self._validate_metadata(document.metadata)
+            and self._validate_language(document.language)
+            and self._validate_status(document.status)
+        )
+        
+        # Zusätzliche strikte Validierungen
+        if is_valid and self.strict_mode:
+            is_valid = (
+                self._validate_topics(document.topics)
+                and self._validate_scores(document)
+            )
+        
+        return is_valid
+    
     def _validate_id(self, doc_id: str) -> bool:
         """Validiert eine Dokument-ID."""
         if not doc_id or not isinstance(doc_id, str):
@@ -162,7 +186,21 @@ class DocumentValidator:
         if not url or not isinstance(url, str):
             self.logger.warning("Ungültiger Source-Link: None oder falscher Typ")
             return False
-            
+        
+        # Schnelle Prüfung auf Schema und Host
+        if self.VALID_URL_PATTERN.match(url) is None:
+            self.logger.warning(
+                "Ungültiger Source-Link: Ungültiges URL-Format",
+                extra={"url": url}
+            )
+            return False
+        
+        if not self.strict_mode:
+            return True
+        
+        # Vollständiges Parsen nur im strikten Modus
+        from urllib.parse import urlparse
+        
         try:
             result = urlparse(url)
             is_valid = all([result.scheme, result.netloc])
@@ -179,7 +217,7 @@ class DocumentValidator:
             )
             return False
     
-    async def _validate_metadata(self, metadata: Dict[str, Any]) -> bool:
+    def _validate_metadata(self, metadata: Dict[str, Any]) -> bool:
         """
         Validiert Dokument-Metadaten.
         
@@ -192,22 +230,21 @@ class DocumentValidator:
             self.logger.warning("Ungültige Metadaten: Kein Dictionary")
             return False
             
-        # Pflichtfelder prüfen
-        required_fields = ["created_at"]
-        for field in required_fields:
-            if field not in metadata:
-                self.logger.warning(
-                    f"Pflichtfeld fehlt in Metadaten: {field}"
-                )
-                return False
+        # Pflichtfeld prüfen (einmaliger Lookup)
+        created_at = metadata.get("created_at", _MISSING)
+        if created_at is _MISSING:
+            self.logger.warning(
+                "Pflichtfeld fehlt in Metadaten: created_at"
+            )
+            return False
         
         # Datumsformat prüfen
         try:
-            datetime.fromisoformat(metadata["created_at"])
+            parse_iso_datetime(created_at)
         except (ValueError, TypeError):
             self.logger.warning(
                 "Ungültiges Datumsformat in Metadaten",
-                extra={"created_at": metadata.get("created_at")}
+                extra={"created_at": created_at}
             )
             return False
         
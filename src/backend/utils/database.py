@@ -4,7 +4,14 @@ Stellt die zentrale Schnittstelle für Vektordatenbank-Operationen bereit.
 """
 
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+import asyncio
+from typing import Optional, List, Dict, Any, Set, Tuple, Union, Callable
+import json
+import operator
+import sqlite3
+import threading
+import time
+import numpy as np
 import chromadb
 from chromadb.config import Settings as ChromaSettings
 from chromadb.api import Collection
@@ -15,13 +22,162 @@ from src.config.logging_config import (
     get_logger, 
     log_execution_time,
     log_error_with_context,
-    request_context,
     log_function_call
 )
 
 # Logger für dieses Modul initialisieren
 logger = get_logger(__name__)
 
+# Embeddings als Listen oder als (n, d)-Array
+EmbeddingMatrix = Union[np.ndarray, List[List[float]]]
+
+def _as_embedding_matrix(embeddings: EmbeddingMatrix) -> np.ndarray:
+    """Wandelt Embeddings einmalig in ein zusammenhängendes float32-Array um."""
+    return np.ascontiguousarray(embeddings, dtype=np.float32)
+
+# Überabtastung der Vektorsuche bei nachgelagertem Metadaten-Filter
+POST_FILTER_OVERSHOOT = 4
+
+_WHERE_OPERATORS = {
+    "$eq": operator.eq,
+    "$ne": operator.ne,
+    "$gt": operator.gt,
+    "$gte": operator.ge,
+    "$lt": operator.lt,
+    "$lte": operator.le,
+    "$in": lambda value, options: value in options,
+    "$nin": lambda value, options: value not in options,
+}
+
+def _matches_where(metadata: Dict[str, Any], where: Dict[str, Any]) -> bool:
+    """Prüft Metadaten gegen einen ChromaDB-where-Filter."""
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(_matches_where(metadata, sub) for sub in condition):
+                return False
+        elif key == "$or":
+            if not any(_matches_where(metadata, sub) for sub in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = metadata.get(key)
+            if value is None:
+                return False
+            for op, operand in condition.items():
+                if not _WHERE_OPERATORS[op](value, operand):
+                    return False
+        elif metadata.get(key) != condition:
+            return False
+    return True
+
+def _apply_post_filter(
+    results: Dict[str, Any],
+    where: Dict[str, Any],
+    n_results: int
+) -> Dict[str, Any]:
+    """Filtert überabgetastete Suchergebnisse je Anfrage auf n_results Treffer."""
+    keys = [
+        key for key in ("ids", "documents", "metadatas", "distances")
+        if results.get(key) is not None
+    ]
+    filtered: Dict[str, Any] = {key: [] for key in keys}
+    for row, metadatas in enumerate(results["metadatas"]):
+        kept = [
+            i for i, metadata in enumerate(metadatas)
+            if _matches_where(metadata or {}, where)
+        ][:n_results]
+        for key in keys:
+            column = results[key][row]
+            filtered[key].append([column[i] for i in kept])
+    return filtered
+
+# Metadatenfelder, die als Liste gespeichert und gelesen werden
+LIST_METADATA_KEYS = ("topics", "keywords")
+
+def _normalize_metadata(
+    metadata: Optional[Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """
+    Bringt Metadaten in das flache Format, das ChromaDB speichern kann.
+    
+    None-Werte entfallen, Listen werden zu JSON-Arrays und sonstige Objekte
+    zu ihrer String-Darstellung.
+    """
+    if metadata is None:
+        return None
+    normalized: Dict[str, Any] = {}
+    for key, value in metadata.items():
+        if value is None:
+            continue
+        if isinstance(value, (str, int, float, bool)):
+            normalized[key] = value
+        elif isinstance(value, (list, tuple, set)):
+            normalized[key] = json.dumps(
+                [str(item) for item in value],
+                ensure_ascii=False
+            )
+        else:
+            normalized[key] = str(value)
+    return normalized
+
+def restore_metadata_lists(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Stellt die Listenfelder gespeicherter Metadaten wieder als Listen her.
+    
+    Ältere Einträge mit kommaseparierten Strings werden ebenfalls gelesen.
+    """
+    restored = dict(metadata)
+    for key in LIST_METADATA_KEYS:
+        value = restored.get(key)
+        if not isinstance(value, str):
+            continue
+        if value.startswith("["):
+            try:
+                restored[key] = json.loads(value)
+                continue
+            except ValueError:
+                pass
+        restored[key] = [item for item in value.split(", ") if item]
+    return restored
+
+def split_query_results(results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Zerlegt das Ergebnis einer Multi-Query in Einzelergebnisse.
+    
+    Jedes Element hat das Format einer Anfrage mit nur einem Embedding.
+    """
+    keys = [
+        key for key in ("ids", "documents", "metadatas", "distances")
+        if key in results
+    ]
+    return [
+        {key: [results[key][row]] for key in keys}
+        for row in range(len(results["ids"]))
+    ]
+
+def _enable_sqlite_wal(db_path: Path) -> str:
+    """
+    Stellt die ChromaDB-SQLite-Datei auf Write-Ahead-Logging um.
+    
+    Der Journal-Modus wird in der Datei gespeichert und gilt damit auch für
+    die Verbindungen, die ChromaDB später selbst öffnet.
+    """
+    connection = sqlite3.connect(str(db_path))
+    try:
+        return connection.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+    finally:
+        connection.close()
+
+# Schreibsperren und Schreibzähler je Persistenz-Verzeichnis, geteilt von
+# allen Managern im Prozess
+_write_locks: Dict[str, threading.Lock] = {}
+_write_generations: Dict[str, int] = {}
+_write_locks_guard = threading.Lock()
+
+def _write_lock_for(store_key: str) -> threading.Lock:
+    """Liefert die gemeinsame Schreibsperre eines Persistenz-Verzeichnisses."""
+    with _write_locks_guard:
+        return _write_locks.setdefault(store_key, threading.Lock())
+
 class DatabaseError(Exception):
     """Basis-Exception für datenbankbezogene Fehler."""
     pass
@@ -34,10 +190,14 @@ class ChromaDBManager:
     grundlegende Datenbankoperationen bereit.
     """
     
+    # Gültigkeitsdauer des gecachten Dokumentenzählers in Sekunden
+    COUNT_CACHE_TTL = 5.0
+    
     def __init__(
         self,
         persist_directory: Optional[str] = None,
-        collection_name: Optional[str] = None
+        collection_name: Optional[str] = None,
+        bulk_load_mode: bool = False
     ):
         """
         Initialisiert den ChromaDB-Manager.
@@ -45,11 +205,21 @@ class ChromaDBManager:
         Args:
             persist_directory: Optionaler Pfad zum Persistenz-Verzeichnis
             collection_name: Optionaler Name der Collection
+            bulk_load_mode: Neue Collection mit schwächerem HNSW-Graphen für
+                schnelles Massen-Einfügen anlegen
         """
         self.persist_directory = persist_directory or settings.database.persist_directory
         self.collection_name = collection_name or settings.database.collection_name
+        self.bulk_load_mode = bulk_load_mode
         self._client = None
         self._collection = None
+        self._count_cache: Optional[Tuple[int, float]] = None
+        # Schreibzugriffe aller Manager auf dasselbe Verzeichnis nacheinander
+        # ausführen statt parallel um die SQLite- und Index-Sperren zu
+        # konkurrieren. Die Sperre wird im Worker-Thread gehalten und ist
+        # damit unabhängig von der Event-Loop (Streamlit: asyncio.run je Rerun).
+        self._store_key = str(Path(self.persist_directory).resolve())
+        self._write_lock = _write_lock_for(self._store_key)
         self.logger = get_logger(f"{__name__}.{self.__class__.__name__}")
     
     @log_function_call(logger)
@@ -81,6 +251,17 @@ class ChromaDBManager:
                         f"{self.persist_directory}"
                     )
             
+                # WAL vor der ersten Transaktion von ChromaDB aktivieren
+                if settings.database.sqlite_wal_mode:
+                    journal_mode = await asyncio.to_thread(
+                        _enable_sqlite_wal,
+                        persist_path / "chroma.sqlite3"
+                    )
+                    self.logger.debug(
+                        "SQLite-Journal-Modus gesetzt",
+                        extra={"journal_mode": journal_mode}
+                    )
+                
                 # Client mit optimierten Einstellungen initialisieren
                 self._client = chromadb.PersistentClient(
                     path=str(persist_path),
@@ -91,10 +272,14 @@ class ChromaDBManager:
                     )
                 )
             
-                # Collection erstellen/laden mit Basis-Einstellungen
+                # Collection erstellen/laden; HNSW-Parameter greifen nur bei
+                # der Erstellung, eine vorhandene Collection behält ihre Werte
                 self._collection = self._client.get_or_create_collection(
                     name=self.collection_name,
-                    metadata={"description": "Document collection for vehicle expert chatbot"}
+                    metadata={
+                        "description": "Document collection for vehicle expert chatbot",
+                        **self._hnsw_metadata()
+                    }
                 )
             
                 self.logger.info(
@@ -121,12 +306,86 @@ class ChromaDBManager:
                 f"ChromaDB-Initialisierung fehlgeschlagen: {str(e)}"
             )
     
+    def _hnsw_metadata(self) -> Dict[str, int]:
+        """Liefert die HNSW-Parameter für eine neue Collection."""
+        db_settings = settings.database
+        if self.bulk_load_mode:
+            construction_ef = db_settings.hnsw_bulk_construction_ef
+            m = db_settings.hnsw_bulk_m
+        else:
+            construction_ef = db_settings.hnsw_construction_ef
+            m = db_settings.hnsw_m
+        return {
+            "hnsw:construction_ef": construction_ef,
+            "hnsw:M": m,
+            "hnsw:search_ef": db_settings.hnsw_search_ef
+        }
+    
+    @log_function_call(logger)
+    async def set_search_ef(self, search_ef: int) -> None:
+        """
+        Passt search_ef einer bestehenden Collection an, z.B. nach einem
+        Bulk-Load. M und construction_ef lassen sich nach der Erstellung
+        nicht mehr ändern.
+        
+        Args:
+            search_ef: Neuer ef-Wert für Suchanfragen
+        
+        Raises:
+            DatabaseError: Bei Fehlern während der Anpassung
+        """
+        try:
+            metadata = dict(self.collection.metadata or {})
+            metadata["hnsw:search_ef"] = search_ef
+            await asyncio.to_thread(
+                self._locked_write,
+                self.collection.modify,
+                metadata=metadata
+            )
+            
+            self.logger.info(
+                "HNSW search_ef angepasst",
+                extra={"search_ef": search_ef}
+            )
+        
+        except Exception as e:
+            log_error_with_context(
+                self.logger,
+                e,
+                {"search_ef": search_ef},
+                "Fehler beim Anpassen von search_ef"
+            )
+            raise DatabaseError(f"Fehler beim Anpassen von search_ef: {str(e)}")
+    
+    def _locked_write(self, operation: Callable[..., Any], **kwargs: Any) -> None:
+        """
+        Führt eine Schreiboperation unter der Sperre des Verzeichnisses aus.
+        
+        Wird im Worker-Thread aufgerufen (asyncio.to_thread).
+        """
+        with self._write_lock:
+            try:
+                operation(**kwargs)
+            finally:
+                _write_generations[self._store_key] = self.write_generation + 1
+    
+    @property
+    def write_generation(self) -> int:
+        """
+        Anzahl der Schreibvorgänge auf das Persistenz-Verzeichnis.
+        
+        Der Zähler ist für alle Manager auf demselben Verzeichnis im Prozess
+        gleich und eignet sich als Versionsbestandteil von Cache-Schlüsseln.
+        """
+        return _write_generations.get(self._store_key, 0)
+    
     @log_function_call(logger)
     async def cleanup(self) -> None:
         """Bereinigt Datenbankressourcen."""
         self.logger.info("Bereinige Datenbankressourcen")
         self._client = None
         self._collection = None
+        self._count_cache = None
     
     @property
     def collection(self) -> Collection:
@@ -144,35 +403,77 @@ class ChromaDBManager:
             raise DatabaseError("Datenbank nicht initialisiert")
         return self._collection
     
+    def count(self) -> int:
+        """
+        Gibt die Anzahl der Dokumente in der Collection zurück.
+        
+        Der Wert wird für COUNT_CACHE_TTL Sekunden gecacht und bei
+        Schreiboperationen über diesen Manager verworfen.
+        
+        Returns:
+            Anzahl der gespeicherten Dokumente
+            
+        Raises:
+            DatabaseError: Wenn die Datenbank nicht initialisiert ist
+        """
+        now = time.monotonic()
+        if self._count_cache is not None:
+            value, timestamp = self._count_cache
+            if now - timestamp < self.COUNT_CACHE_TTL:
+                return value
+        
+        value = self.collection.count()
+        self._count_cache = (value, now)
+        return value
+    
     @log_function_call(logger)
     async def add_documents(
         self,
         ids: List[str],
-        embeddings: List[List[float]],
+        embeddings: EmbeddingMatrix,
         documents: List[str],
-        metadatas: Optional[List[Dict[str, Any]]] = None
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        batch_size: Optional[int] = None
     ) -> None:
         """
         Fügt Dokumente zur Collection hinzu.
         
+        Große Mengen werden in Teil-Batches geschrieben, um einzelne
+        übergroße Transaktionen zu vermeiden.
+        
         Args:
             ids: Liste der Dokument-IDs
-            embeddings: Liste der Embedding-Vektoren
+            embeddings: Embedding-Matrix der Form (Anzahl, Dimension)
             documents: Liste der Dokument-Texte
             metadatas: Optionale Liste von Metadaten-Dictionaries
+            batch_size: Optionale Batch-Größe (Standard aus den Einstellungen)
             
         Raises:
             DatabaseError: Bei Fehlern während des Hinzufügens
         """
+        batch_size = batch_size or settings.database.batch_size
+        embeddings = _as_embedding_matrix(embeddings)
+        if metadatas is not None:
+            metadatas = [_normalize_metadata(metadata) for metadata in metadatas]
+        if embeddings.ndim != 2 or embeddings.shape[0] != len(ids):
+            raise DatabaseError(
+                f"Embeddings der Form {embeddings.shape} passen nicht zu "
+                f"{len(ids)} Dokumenten"
+            )
+        
         try:
             with log_execution_time(self.logger, "add_documents"):
-                with request_context():
-                    self.collection.add(
-                        ids=ids,
-                        embeddings=embeddings,
-                        documents=documents,
-                        metadatas=metadatas
+                for start in range(0, len(ids), batch_size):
+                    end = start + batch_size
+                    await asyncio.to_thread(
+                        self._locked_write,
+                        self.collection.add,
+                        ids=ids[start:end],
+                        embeddings=embeddings[start:end],
+                        documents=documents[start:end],
+                        metadatas=metadatas[start:end] if metadatas is not None else None
                     )
+                    self._count_cache = None
                     
             self.logger.info(
                 f"Erfolgreich {len(documents)} Dokumente hinzugefügt",
@@ -198,9 +499,10 @@ class ChromaDBManager:
     @log_function_call(logger)
     async def query(
         self,
-        query_embeddings: List[List[float]],
+        query_embeddings: EmbeddingMatrix,
         n_results: int = 5,
-        where: Optional[Dict[str, Any]] = None
+        where: Optional[Dict[str, Any]] = None,
+        post_filter: bool = False
     ) -> Dict[str, Any]:
         """
         Sucht in der Collection mittels Embeddings.
@@ -209,6 +511,9 @@ class ChromaDBManager:
             query_embeddings: Liste der Anfrage-Embedding-Vektoren
             n_results: Anzahl der gewünschten Ergebnisse
             where: Optionaler Filter für die Suche
+            post_filter: Filter erst nach einer überabgetasteten Vektorsuche
+                anwenden statt als Vorfilter; lohnt sich nur für wenig
+                selektive Filter, da sonst Treffer fehlen können
             
         Returns:
             Dict mit Suchergebnissen
@@ -218,36 +523,46 @@ class ChromaDBManager:
         """
         try:
             with log_execution_time(self.logger, "query_documents"):
-                with request_context():
-                    if not query_embeddings:
-                        # Wenn keine Embeddings übergeben wurden, führe Metadaten-Suche durch
-                        results = self.collection.get(
-                            where=where
-                        )
-                    else:
-                        results = self.collection.query(
-                            query_embeddings=query_embeddings,
-                            n_results=n_results,
-                            where=where
-                        )
-            
-                    # Ergebnisse in einheitliches Format bringen
-                    formatted_results = {
-                        'ids': results['ids'] if isinstance(results['ids'], list) else [results['ids']],
-                        'documents': results['documents'] if isinstance(results['documents'], list) else [results['documents']],
-                        'metadatas': results['metadatas'] if isinstance(results['metadatas'], list) else [results['metadatas']]
-                    }
-            
-                    self.logger.info(
-                        f"Suchanfrage ausgeführt",
-                        extra={
-                            'n_results': n_results,
-                            'filter_applied': bool(where),
-                            'results_found': len(formatted_results['ids'])
-                        }
+                if len(query_embeddings) == 0:
+                    # Wenn keine Embeddings übergeben wurden, führe Metadaten-Suche durch
+                    results = await asyncio.to_thread(
+                        self.collection.get,
+                        where=where
+                    )
+                elif post_filter and where:
+                    results = await asyncio.to_thread(
+                        self.collection.query,
+                        query_embeddings=_as_embedding_matrix(query_embeddings),
+                        n_results=n_results * POST_FILTER_OVERSHOOT
+                    )
+                    results = _apply_post_filter(results, where, n_results)
+                else:
+                    results = await asyncio.to_thread(
+                        self.collection.query,
+                        query_embeddings=_as_embedding_matrix(query_embeddings),
+                        n_results=n_results,
+                        where=where
                     )
             
-                    return formatted_results
+                # Ergebnisse in einheitliches Format bringen
+                formatted_results = {
+                    'ids': results['ids'] if isinstance(results['ids'], list) else [results['ids']],
+                    'documents': results['documents'] if isinstance(results['documents'], list) else [results['documents']],
+                    'metadatas': results['metadatas'] if isinstance(results['metadatas'], list) else [results['metadatas']]
+                }
+                if results.get('distances'):
+                    formatted_results['distances'] = results['distances']
+            
+                self.logger.info(
+                    f"Suchanfrage ausgeführt",
+                    extra={
+                        'n_results': n_results,
+                        'filter_applied': bool(where),
+                        'results_found': len(formatted_results['ids'])
+                    }
+                )
+            
+                return formatted_results
             
         except Exception as e:
             error_context = {
@@ -262,6 +577,188 @@ class ChromaDBManager:
             )
             raise DatabaseError(f"Fehler bei der Dokumentensuche: {str(e)}")
     
+    @log_function_call(logger)
+    async def exists(self, id: str) -> bool:
+        """
+        Prüft ob ein Dokument mit der ID existiert.
+        
+        Lädt weder Inhalte noch Metadaten oder Embeddings.
+        
+        Args:
+            id: ID des Dokuments
+        
+        Returns:
+            True wenn das Dokument existiert
+        
+        Raises:
+            DatabaseError: Bei Fehlern während der Prüfung
+        """
+        try:
+            results = await asyncio.to_thread(
+                self.collection.get,
+                ids=[id],
+                include=[]
+            )
+            return bool(results.get("ids"))
+        
+        except Exception as e:
+            log_error_with_context(
+                self.logger,
+                e,
+                {"document_id": id},
+                "Fehler bei der Existenzprüfung"
+            )
+            raise DatabaseError(f"Fehler bei der Existenzprüfung: {str(e)}")
+    
+    @log_function_call(logger)
+    async def get_embedding(self, id: str) -> Optional[np.ndarray]:
+        """
+        Liest den gespeicherten Embedding-Vektor eines Dokuments.
+        
+        Args:
+            id: ID des Dokuments
+        
+        Returns:
+            Gespeicherter Embedding-Vektor als float32-Array oder None falls
+            nicht vorhanden
+        
+        Raises:
+            DatabaseError: Bei Fehlern während des Abrufs
+        """
+        try:
+            results = await asyncio.to_thread(
+                self.collection.get,
+                ids=[id],
+                include=["embeddings"]
+            )
+            
+            embeddings = results.get("embeddings")
+            if embeddings is None or len(embeddings) == 0:
+                return None
+            return np.asarray(embeddings[0], dtype=np.float32)
+        
+        except Exception as e:
+            log_error_with_context(
+                self.logger,
+                e,
+                {"document_id": id},
+                "Fehler beim Abruf des Embeddings"
+            )
+            raise DatabaseError(f"Fehler beim Abruf des Embeddings: {str(e)}")
+    
+    @log_function_call(logger)
+    async def get_embeddings(self, ids: List[str]) -> Optional[np.ndarray]:
+        """
+        Liest die gespeicherten Embedding-Vektoren mehrerer Dokumente.
+        
+        Nicht vorhandene IDs werden übersprungen; die Zeilenreihenfolge
+        entspricht nicht zwingend der Reihenfolge der IDs.
+        
+        Args:
+            ids: IDs der Dokumente
+        
+        Returns:
+            float32-Matrix mit einer Zeile je gefundenem Dokument oder None
+            falls keines existiert
+        
+        Raises:
+            DatabaseError: Bei Fehlern während des Abrufs
+        """
+        try:
+            results = await asyncio.to_thread(
+                self.collection.get,
+                ids=ids,
+                include=["embeddings"]
+            )
+            
+            embeddings = results.get("embeddings")
+            if embeddings is None or len(embeddings) == 0:
+                return None
+            return _as_embedding_matrix(embeddings)
+        
+        except Exception as e:
+            log_error_with_context(
+                self.logger,
+                e,
+                {"id_count": len(ids)},
+                "Fehler beim Abruf der Embeddings"
+            )
+            raise DatabaseError(f"Fehler beim Abruf der Embeddings: {str(e)}")
+    
+    @log_function_call(logger)
+    async def get_metadata(self, id: str) -> Optional[Dict[str, Any]]:
+        """
+        Liest die gespeicherten Metadaten eines Dokuments.
+        
+        Args:
+            id: ID des Dokuments
+        
+        Returns:
+            Gespeicherte Metadaten oder None falls das Dokument nicht existiert
+        
+        Raises:
+            DatabaseError: Bei Fehlern während des Abrufs
+        """
+        try:
+            results = await asyncio.to_thread(
+                self.collection.get,
+                ids=[id],
+                include=["metadatas"]
+            )
+            
+            if not results.get("ids"):
+                return None
+            return results["metadatas"][0] or {}
+        
+        except Exception as e:
+            log_error_with_context(
+                self.logger,
+                e,
+                {"document_id": id},
+                "Fehler beim Abruf der Metadaten"
+            )
+            raise DatabaseError(f"Fehler beim Abruf der Metadaten: {str(e)}")
+    
+    @log_function_call(logger)
+    async def get_by_ids(self, ids: List[str]) -> Dict[str, Any]:
+        """
+        Liest Dokumente direkt über ihre IDs ohne Metadaten-Filter.
+        
+        Nicht vorhandene IDs werden übersprungen. Das Ergebnis hat dasselbe
+        verschachtelte Format wie eine einzelne Suchanfrage.
+        
+        Args:
+            ids: IDs der gewünschten Dokumente
+        
+        Returns:
+            Dict mit 'ids', 'documents' und 'metadatas'
+        
+        Raises:
+            DatabaseError: Bei Fehlern während des Abrufs
+        """
+        try:
+            with log_execution_time(self.logger, "get_documents_by_ids"):
+                results = await asyncio.to_thread(
+                    self.collection.get,
+                    ids=ids,
+                    include=["documents", "metadatas"]
+                )
+            
+            return {
+                'ids': [results.get('ids') or []],
+                'documents': [results.get('documents') or []],
+                'metadatas': [results.get('metadatas') or []]
+            }
+        
+        except Exception as e:
+            log_error_with_context(
+                self.logger,
+                e,
+                {"id_count": len(ids)},
+                "Fehler beim Abruf über IDs"
+            )
+            raise DatabaseError(f"Fehler beim Abruf über IDs: {str(e)}")
+    
     @log_function_call(logger)
     async def delete(self, ids: List[str]) -> None:
         """
@@ -275,8 +772,12 @@ class ChromaDBManager:
         """
         try:
             with log_execution_time(self.logger, "delete_documents"):
-                with request_context():
-                    self.collection.delete(ids=ids)
+                await asyncio.to_thread(
+                    self._locked_write,
+                    self.collection.delete,
+                    ids=ids
+                )
+                self._count_cache = None
             
             self.logger.info(
                 f"Erfolgreich {len(ids)} Dokumente gelöscht",
@@ -303,7 +804,7 @@ class ChromaDBManager:
     async def update(
         self,
         id: str,
-        embedding: List[float],
+        embedding: Union[np.ndarray, List[float]],
         document: str,
         metadata: Optional[Dict[str, Any]] = None
     ) -> None:
@@ -321,13 +822,14 @@ class ChromaDBManager:
         """
         try:
             with log_execution_time(self.logger, "update_document"):
-                with request_context():
-                    self.collection.update(
-                        ids=[id],
-                        embeddings=[embedding],
-                        documents=[document],
-                        metadatas=[metadata] if metadata else None
-                    )
+                await asyncio.to_thread(
+                    self._locked_write,
+                    self.collection.update,
+                    ids=[id],
+                    embeddings=_as_embedding_matrix([embedding]),
+                    documents=[document],
+                    metadatas=[_normalize_metadata(metadata)] if metadata else None
+                )
             
             self.logger.info(
                 f"Dokument erfolgreich aktualisiert",
@@ -350,6 +852,54 @@ class ChromaDBManager:
             )
             raise DatabaseError(f"Fehler bei der Dokumentaktualisierung: {str(e)}")
     
+    @log_function_call(logger)
+    async def update_metadatas(
+        self,
+        ids: List[str],
+        metadatas: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Aktualisiert nur die Metadaten mehrerer Dokumente.
+        
+        Inhalt und Embeddings bleiben unverändert.
+        
+        Args:
+            ids: IDs der zu aktualisierenden Dokumente
+            metadatas: Neue Metadaten je Dokument
+            
+        Raises:
+            DatabaseError: Bei Fehlern während der Aktualisierung
+        """
+        try:
+            with log_execution_time(self.logger, "update_metadatas"):
+                await asyncio.to_thread(
+                    self._locked_write,
+                    self.collection.update,
+                    ids=ids,
+                    metadatas=[_normalize_metadata(metadata) for metadata in metadatas]
+                )
+            
+            self.logger.info(
+                f"Metadaten von {len(ids)} Dokumenten aktualisiert",
+                extra={
+                    "document_count": len(ids),
+                    "first_id": ids[0] if ids else None
+                }
+            )
+            
+        except Exception as e:
+            error_context = {
+                "document_count": len(ids),
+                "first_id": ids[0] if ids else None
+            }
+            log_error_with_context(
+                self.logger,
+                e,
+                error_context,
+                "Fehler bei der Metadatenaktualisierung"
+            )
+            raise DatabaseError(f"Fehler bei der Metadatenaktualisierung: {str(e)}")
+    
     @asynccontextmanager
     async def transaction(self):
         """
@@ -359,9 +909,8 @@ class ChromaDBManager:
             DatabaseError: Bei Fehlern während der Transaktion
         """
         try:
-            with request_context():
-                yield self
-                
+            yield self
+            
         except Exception as e:
             log_error_with_context(
                 self.logger,
@@ -369,4 +918,126 @@ class ChromaDBManager:
                 {},
                 "Fehler während der Datenbanktransaktion"
             )
-            raise DatabaseError(f"Transaktion fehlgeschlagen: {str(e)}")
\ No newline at end of file
+            raise DatabaseError(f"Transaktion fehlgeschlagen: {str(e)}")
+
+class QueryBatcher:
+    """
+    Bündelt gleichzeitige Einzelsuchen zu gemeinsamen Multi-Query-Aufrufen.
+    
+    Suchen mit gleichem Limit und Filter, die im selben Durchlauf der
+    Event-Loop eintreffen, werden mit einem einzigen query-Aufruf und
+    mehreren Anfrage-Embeddings ausgeführt. Nur während ein Batch läuft,
+    wird bis zu max_wait auf weitere Anfragen gewartet.
+    """
+    
+    def __init__(
+        self,
+        db: ChromaDBManager,
+        max_batch_size: int = 32,
+        max_wait: float = 0.005
+    ):
+        """
+        Initialisiert den Query-Batcher.
+        
+        Args:
+            db: Manager für die eigentliche Vektorsuche
+            max_batch_size: Batch-Größe, ab der sofort verarbeitet wird
+            max_wait: Maximale Wartezeit auf weitere Anfragen in Sekunden,
+                solange noch ein Batch verarbeitet wird
+        """
+        self._db = db
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait
+        self._pending: Dict[Tuple[int, str, bool], List[Tuple[Any, asyncio.Future]]] = {}
+        self._filters: Dict[Tuple[int, str, bool], Optional[Dict[str, Any]]] = {}
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.logger = get_logger(f"{__name__}.QueryBatcher")
+    
+    async def query(
+        self,
+        query_embedding: Union[np.ndarray, List[float]],
+        n_results: int = 5,
+        where: Optional[Dict[str, Any]] = None,
+        post_filter: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Führt eine Suche aus, gebündelt mit gleichzeitigen Anfragen.
+        
+        Args:
+            query_embedding: Embedding-Vektor der Anfrage
+            n_results: Anzahl der gewünschten Ergebnisse
+            where: Optionaler Filter für die Suche
+            post_filter: Filter nach der Vektorsuche anwenden
+            
+        Returns:
+            Suchergebnis im Format einer einzelnen Anfrage
+            
+        Raises:
+            DatabaseError: Bei Fehlern während der Suche
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = (n_results, json.dumps(where, sort_keys=True, default=str), post_filter)
+        group = self._pending.setdefault(key, [])
+        group.append((query_embedding, future))
+        self._filters[key] = where
+        
+        if len(group) >= self._max_batch_size:
+            self._flush_group(key)
+        elif self._flush_handle is None:
+            if self._tasks:
+                # Während ein Batch läuft, weitere Anfragen sammeln
+                self._flush_handle = loop.call_later(self._max_wait, self._flush)
+            else:
+                # Sonst nur die Anfragen desselben Loop-Durchlaufs bündeln
+                self._flush_handle = loop.call_soon(self._flush)
+        
+        return await future
+    
+    def _flush(self) -> None:
+        """Startet die Verarbeitung aller wartenden Anfragen."""
+        self._flush_handle = None
+        for key in list(self._pending):
+            self._flush_group(key)
+    
+    def _flush_group(self, key: Tuple[int, str, bool]) -> None:
+        """Startet die Verarbeitung einer Gruppe gleichartiger Anfragen."""
+        batch = self._pending.pop(key, None)
+        where = self._filters.pop(key, None)
+        if batch:
+            n_results, _, post_filter = key
+            task = asyncio.create_task(
+                self._process_batch(batch, n_results, where, post_filter)
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _process_batch(
+        self,
+        batch: List[Tuple[Any, asyncio.Future]],
+        n_results: int,
+        where: Optional[Dict[str, Any]],
+        post_filter: bool
+    ) -> None:
+        """Verarbeitet einen Batch und verteilt die Ergebnisse."""
+        try:
+            results = await self._db.query(
+                query_embeddings=[embedding for embedding, _ in batch],
+                n_results=n_results,
+                where=where,
+                post_filter=post_filter
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        self.logger.debug(
+            "Query-Batch verarbeitet",
+            extra={"batch_size": len(batch)}
+        )
+        for (_, future), row_results in zip(batch, split_query_results(results)):
+            if not future.done():
+                future.set_result(row_results)
@@ -1,26 +1,75 @@
+import atexit
 import logging
 import logging.config
+import logging.handlers
+import os
+import queue
 import sys
 import time
+import traceback
 import uuid
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional
 from contextvars import ContextVar
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from logging.handlers import QueueHandler, QueueListener
 
 # Context Variable für Request-ID Tracking
 request_id_context: ContextVar[str] = ContextVar('request_id', default='')
 
-class RequestIdFilter(logging.Filter):
+def add_request_id(record: logging.LogRecord, _get=request_id_context.get) -> bool:
     """
     Filter zur Anreicherung der Log-Nachrichten mit Request-IDs.
-    Fügt jedem Log-Eintrag eine eindeutige Request-ID hinzu.
+    
+    Als einfache Funktion registriert, da logging aufrufbare Filter direkt
+    unterstützt. Bereits im aufrufenden Kontext gesetzte IDs bleiben
+    erhalten, da Handler hinter der Log-Queue in einem anderen Thread laufen.
+    """
+    record.__dict__.setdefault('request_id', _get(''))
+    return True
+
+def make_request_id_filter():
+    """Factory für die dictConfig-Konfiguration des Request-ID-Filters."""
+    return add_request_id
+
+# Listener für die asynchron bedienten Root-Handler
+_queue_listener: Optional[QueueListener] = None
+
+def _start_queue_listener(root: logging.Logger) -> None:
     """
+    Verlagert die Handler des Root-Loggers in einen Hintergrund-Thread.
     
-    def filter(self, record):
-        record.request_id = request_id_context.get('')
-        return True
+    Der Root-Logger schreibt nur noch in eine Queue; Datei- und
+    Konsolenausgabe blockieren damit nicht mehr den aufrufenden Thread.
+    """
+    global _queue_listener
+    handlers = list(root.handlers)
+    log_queue: queue.Queue = queue.Queue(-1)
+    queue_handler = QueueHandler(log_queue)
+    # Request-ID im aufrufenden Kontext übernehmen
+    queue_handler.addFilter(add_request_id)
+    
+    for handler in handlers:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    
+    _queue_listener = QueueListener(
+        log_queue,
+        *handlers,
+        respect_handler_level=True
+    )
+    _queue_listener.start()
+
+def _stop_queue_listener() -> None:
+    """Beendet den Listener und schreibt ausstehende Log-Einträge."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+atexit.register(_stop_queue_listener)
 
 @contextmanager
 def request_context():
@@ -39,11 +88,13 @@ def request_context():
     finally:
         request_id_context.reset(token)
 
-@contextmanager
 def log_execution_time(logger: logging.Logger, operation_name: str):
     """
     Kontext-Manager zum Tracking der Ausführungszeit von Operationen.
     
+    Ist INFO für den Logger deaktiviert, wird ein leerer Kontext-Manager
+    zurückgegeben und keine Zeit gemessen.
+    
     Args:
         logger: Der Logger für die Zeiterfassung
         operation_name: Name/Beschreibung der Operation
@@ -52,18 +103,46 @@ def log_execution_time(logger: logging.Logger, operation_name: str):
         with log_execution_time(logger, "Dokumentenverarbeitung"):
             process_documents()
     """
-    start_time = time.perf_counter()
+    if not logger.isEnabledFor(logging.INFO):
+        return nullcontext()
+    return _timed_execution(logger, operation_name)
+
+@contextmanager
+def _timed_execution(logger: logging.Logger, operation_name: str):
+    """Misst die Ausführungszeit in Mikrosekunden und protokolliert sie."""
+    start_ns = time.monotonic_ns()
     try:
         yield
     finally:
-        execution_time = (time.perf_counter() - start_time) * 1000
-        logger.info(
-            f"{operation_name} ausgeführt",
-            extra={
-                "execution_time": execution_time,
-                "operation": operation_name
-            }
-        )
+        _log_elapsed(logger, operation_name, start_ns)
+
+def _log_elapsed(logger: logging.Logger, operation_name: str, start_ns: int) -> None:
+    """Protokolliert die seit start_ns vergangene Zeit in Mikrosekunden."""
+    logger.info(
+        f"{operation_name} ausgeführt",
+        extra={
+            "execution_time_us": (time.monotonic_ns() - start_ns) // 1000,
+            "operation": operation_name
+        }
+    )
+
+class _DeferredTraceback:
+    """
+    Hält die Exception-Information und formatiert den Stacktrace erst bei
+    Bedarf, z.B. im Thread des Queue-Listeners statt im aufrufenden Code.
+    """
+    
+    __slots__ = ("_exc_info", "_text")
+    
+    def __init__(self, exc_info):
+        self._exc_info = exc_info
+        self._text: Optional[str] = None
+    
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = "".join(traceback.format_exception(*self._exc_info))
+            self._exc_info = None
+        return self._text
 
 def log_error_with_context(
     logger: logging.Logger,
@@ -100,8 +179,7 @@ def log_error_with_context(
     error_info = {
         'error_type': type(error).__name__,
         'error_message': str(error),
-        'context': context,
-        'timestamp': datetime.utcnow().isoformat()
+        'context': context
     }
     
     # Fehler mit ERROR-Level protokollieren
@@ -109,10 +187,61 @@ def log_error_with_context(
         f"{message}: {error_info['error_type']} - {error_info['error_message']}",
         extra={
             'error_details': error_info,
-            'stack_trace': logging.traceback.format_exc()
+            # Stacktrace erst beim Ausgeben formatieren
+            'stack_trace': _DeferredTraceback(sys.exc_info())
         }
     )
 
+class SizeTrackingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    RotatingFileHandler ohne stat-Aufrufe pro Log-Eintrag.
+    
+    Die Dateigröße in Bytes wird beim Öffnen gelesen und nach jedem
+    Schreiben aus der Dateiposition (stream.tell) übernommen. Im
+    Append-Modus enthält diese auch Einträge anderer Prozesse, und
+    Mehrbyte-Zeichen werden korrekt gezählt. Jeder Eintrag wird nur einmal
+    formatiert; der Standard-Handler prüft dagegen bei jedem emit den
+    Dateityp, springt ans Dateiende und formatiert den Eintrag dafür doppelt.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        self._size = 0
+        super().__init__(*args, **kwargs)
+        if self.stream is None:
+            # Verzögertes Öffnen: Größe trotzdem schon kennen
+            self._size = self._file_size()
+    
+    def _open(self):
+        """Öffnet die Log-Datei und gleicht den Größenzähler ab."""
+        stream = super()._open()
+        self._size = self._file_size()
+        return stream
+    
+    def _file_size(self) -> int:
+        """Liest die aktuelle Größe der Log-Datei."""
+        try:
+            return os.path.getsize(self.baseFilename)
+        except OSError:
+            return 0
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        """Schreibt den Eintrag und rotiert bei Erreichen von maxBytes."""
+        try:
+            msg = self.format(record) + self.terminator
+            # Bytes statt Zeichen zählen, passend zu stream.tell()
+            msg_size = len(msg.encode(self.encoding or "utf-8"))
+            if 0 < self.maxBytes <= self._size + msg_size and self._size > 0:
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(msg)
+            self.flush()
+            self._size = self.stream.tell()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
 def setup_logging(
     debug: bool = False,
     log_dir: str = "logs",
@@ -146,13 +275,13 @@ def setup_logging(
                 "format": "%(levelname)s: %(message)s"
             },
             "performance": {
-                "format": "%(asctime)s [PERFORMANCE] [%(request_id)s] %(message)s - Zeit: %(execution_time).2fms"
+                "format": "%(asctime)s [PERFORMANCE] [%(request_id)s] %(message)s - Zeit: %(execution_time_us)dus"
             }
         },
         
         "filters": {
             "request_id": {
-                "()": RequestIdFilter
+                "()": make_request_id_filter
             }
         },
         
@@ -165,7 +294,7 @@ def setup_logging(
                 "filters": ["request_id"]
             },
             "file": {
-                "class": "logging.handlers.RotatingFileHandler",
+                "()": SizeTrackingRotatingFileHandler,
                 "level": "INFO",
                 "formatter": "detailed",
                 "filename": str(date_dir / "app.log"),
@@ -175,7 +304,7 @@ def setup_logging(
                 "filters": ["request_id"]
             },
             "error_file": {
-                "class": "logging.handlers.RotatingFileHandler",
+                "()": SizeTrackingRotatingFileHandler,
                 "level": "ERROR",
                 "formatter": "detailed",
                 "filename": str(date_dir / "error.log"),
@@ -185,7 +314,7 @@ def setup_logging(
                 "filters": ["request_id"]
             },
             "debug_file": {
-                "class": "logging.handlers.RotatingFileHandler",
+                "()": SizeTrackingRotatingFileHandler,
                 "level": "DEBUG",
                 "formatter": "detailed",
                 "filename": str(date_dir / "debug.log"),
@@ -228,7 +357,7 @@ def setup_logging(
     # Performance-Logging hinzufügen wenn aktiviert
     if enable_performance_logging:
         config["handlers"]["performance_file"] = {
-            "class": "logging.handlers.RotatingFileHandler",
+            "()": SizeTrackingRotatingFileHandler,
             "level": "INFO",
             "formatter": "performance",
             "filename": str(date_dir / "performance.log"),
@@ -243,8 +372,14 @@ def setup_logging(
             "propagate": False
         }
     
-    # Konfiguration anwenden
+    # Konfiguration anwenden (ein vorheriger Listener wird zuerst geleert)
+    _stop_queue_listener()
     logging.config.dictConfig(config)
+    _start_queue_listener(logging.getLogger())
+
+# Bereits angeforderte Logger; logging.getLogger nimmt bei jedem Aufruf
+# das globale Modul-Lock
+_loggers: Dict[str, logging.Logger] = {}
 
 def get_logger(name: str) -> logging.Logger:
     """
@@ -261,13 +396,18 @@ def get_logger(name: str) -> logging.Logger:
         logger.info("Eine Info-Nachricht")
         logger.error("Ein Fehler ist aufgetreten")
     """
-    return logging.getLogger(name)
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers.setdefault(name, logging.getLogger(name))
+    return logger
 
 def log_function_call(logger: logging.Logger):
     """
     Decorator für das Logging von Funktionsaufrufen.
     
     Protokolliert automatisch Start, Ende und eventuelle Fehler von Funktionsaufrufen.
+    Ist DEBUG für den Logger deaktiviert, wird die Funktion ohne zusätzlichen
+    Logging-Aufwand direkt aufgerufen.
     
     Args:
         logger: Der Logger, der verwendet werden soll
@@ -279,15 +419,18 @@ def log_function_call(logger: logging.Logger):
             pass
     """
     def decorator(func):
+        @wraps(func)
         def wrapper(*args, **kwargs):
+            if not logger.isEnabledFor(logging.DEBUG):
+                return func(*args, **kwargs)
+            
             func_name = func.__name__
             logger.debug(f"Starte Funktion: {func_name}")
+            start_ns = time.monotonic_ns()
             try:
-                with log_execution_time(logger, func_name):
-                    result = func(*args, **kwargs)
-                logger.debug(f"Funktion {func_name} erfolgreich beendet")
-                return result
+                result = func(*args, **kwargs)
             except Exception as e:
+                _log_elapsed(logger, func_name, start_ns)
                 log_error_with_context(
                     logger,
                     e,
@@ -298,5 +441,11 @@ def log_function_call(logger: logging.Logger):
                     }
                 )
                 raise
+            _log_elapsed(logger, func_name, start_ns)
+            logger.debug(f"Funktion {func_name} erfolgreich beendet")
+            return result
+        # wraps übernimmt __dict__ und damit __isabstractmethod__; Interfaces
+        # dekorieren abstrakte Methoden, die Implementierungen nicht alle überschreiben
+        wrapper.__dict__.pop("__isabstractmethod__", None)
         return wrapper
     return decorator
\ No newline at end of file
@@ -1,7 +1,6 @@
 from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings
-from pathlib import Path
 
 class LoggingSettings(BaseModel):
     """
@@ -83,12 +82,34 @@ class DatabaseSettings(BaseModel):
         default=384,
         description="Dimension der Dokument-Embeddings"
     )
-    
-    @validator('persist_directory')
-    def create_persist_directory(cls, v):
-        """Stellt sicher, dass das Persistenz-Verzeichnis existiert."""
-        Path(v).mkdir(parents=True, exist_ok=True)
-        return v
+    batch_size: int = Field(
+        default=128,
+        description="Maximale Anzahl Dokumente pro ChromaDB-Insert"
+    )
+    sqlite_wal_mode: bool = Field(
+        default=False,
+        description="SQLite-Datei von ChromaDB im WAL-Modus betreiben"
+    )
+    hnsw_construction_ef: int = Field(
+        default=100,
+        description="HNSW ef beim Indexaufbau (nur bei Collection-Erstellung)"
+    )
+    hnsw_m: int = Field(
+        default=16,
+        description="HNSW Nachbarn pro Knoten (nur bei Collection-Erstellung)"
+    )
+    hnsw_search_ef: int = Field(
+        default=50,
+        description="HNSW ef bei der Suche"
+    )
+    hnsw_bulk_construction_ef: int = Field(
+        default=40,
+        description="HNSW ef beim Indexaufbau im Bulk-Load-Modus"
+    )
+    hnsw_bulk_m: int = Field(
+        default=8,
+        description="HNSW Nachbarn pro Knoten im Bulk-Load-Modus"
+    )
 
 class ChatSettings(BaseModel):
     """
@@ -65,15 +65,13 @@ class ServiceMetrics:
             if not retrieval_service:
                 return {"status": "Not Connected"}
             
-            # Direkt auf die Collection zugreifen
             if not hasattr(retrieval_service.db, "collection"):
                 return {"status": "Not Connected"}
             
-            collection = retrieval_service.db.collection
             return {
                 "status": "Connected",
                 "collection": settings.database.collection_name,
-                "document_count": collection.count(),
+                "document_count": retrieval_service.db.count(),
                 "persist_directory": settings.database.persist_directory
             }
         except Exception as e:
@@ -1,9 +1,14 @@
 # tests/unit/test_embedding_service.py
 
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 import numpy as np
-from src.backend.services.embedding_service import EmbeddingService, EmbeddingServiceError
+from src.backend.services.embedding_service import (
+    EmbeddingService,
+    EmbeddingServiceError,
+    EmbeddingBatcher
+)
 
 @pytest.mark.asyncio
 async def test_embedding_service_initialization():
@@ -32,6 +37,8 @@ async def test_get_embeddings(embedding_service: EmbeddingService):
     
     assert len(embeddings) == len(texts)
     assert all(len(emb) == 3 for emb in embeddings)
+    assert embeddings.dtype == np.float32
+    assert embeddings.shape == (3, 3)
     embedding_service._embeddings.embed_documents.assert_called_once_with(texts)
 
 @pytest.mark.asyncio
@@ -94,4 +101,28 @@ async def test_batch_processing(embedding_service: EmbeddingService):
     
     assert len(embeddings) == len(texts)
     # Should have made 2 calls (150 texts with batch_size=100)
-    assert embedding_service._embeddings.embed_documents.call_count == 2
\ No newline at end of file
+    assert embedding_service._embeddings.embed_documents.call_count == 2
+
+@pytest.mark.asyncio
+async def test_embedding_batcher_coalesces_concurrent_requests(embedding_service: EmbeddingService):
+    """Test that concurrent single requests share one batch call."""
+    batcher = EmbeddingBatcher(embedding_service)
+    
+    embeddings = await asyncio.gather(
+        *(batcher.get_embedding(f"query{i}") for i in range(3))
+    )
+    
+    assert len(embeddings) == 3
+    embedding_service._embeddings.embed_documents.assert_called_once_with(
+        ["query0", "query1", "query2"]
+    )
+
+@pytest.mark.asyncio
+async def test_embedding_batcher_does_not_delay_lone_request(embedding_service: EmbeddingService):
+    """Test that a single request is not held back for the batch window."""
+    batcher = EmbeddingBatcher(embedding_service, max_wait=10.0)
+    
+    embedding = await asyncio.wait_for(batcher.get_embedding("query"), timeout=1.0)
+    
+    assert len(embedding) == 3
+    embedding_service._embeddings.embed_documents.assert_called_once_with(["query"])
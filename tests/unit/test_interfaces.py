@@ -0,0 +1,40 @@
+# tests/unit/test_interfaces.py
+
+import pytest
+from unittest.mock import MagicMock
+
+from src.backend.interfaces.base import BaseService
+from src.backend.services.chat.chat_service import ChatServiceImpl
+from src.backend.services.document_processor import DocumentProcessor
+from src.backend.services.embedding_service import EmbeddingService
+from src.backend.services.retrieval.retrieval_service import RetrievalServiceImpl
+
+
+def _implementations():
+    """Erzeugt je eine Instanz aller konkreten Interface-Implementierungen."""
+    embedding_service = EmbeddingService(model="test-model", embeddings=MagicMock())
+    return [
+        embedding_service,
+        DocumentProcessor(),
+        RetrievalServiceImpl(
+            embedding_service=embedding_service,
+            db_manager=MagicMock()
+        ),
+        ChatServiceImpl(retrieval_service=MagicMock())
+    ]
+
+
+@pytest.mark.asyncio
+async def test_interface_implementations_are_instantiable():
+    """Dekorierte abstrakte Methoden machen Implementierungen nicht abstrakt."""
+    services = _implementations()
+    
+    assert {type(service) for service in services} == {
+        EmbeddingService,
+        DocumentProcessor,
+        RetrievalServiceImpl,
+        ChatServiceImpl
+    }
+    for service in services:
+        assert isinstance(service, BaseService)
+        assert not type(service).__abstractmethods__
@@ -0,0 +1,469 @@
+"""
+Test-Suite für den Retrieval-Service und seine Hilfskomponenten.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.config.settings import settings
+from src.backend.models.document import Document, DocumentType
+from src.backend.services.retrieval.retrieval_service import RetrievalServiceImpl
+from src.backend.services.retrieval.managers.metadata_manager import MetadataManager
+from src.backend.services.retrieval.utils.result_processor import ResultProcessor
+from src.backend.utils.database import _normalize_metadata
+
+
+@pytest.fixture
+def metadata_manager():
+    """Fixture für einen MetadataManager."""
+    return MetadataManager()
+
+
+@pytest.fixture
+async def retrieval_service():
+    """Fixture für einen RetrievalService mit gemockter Datenbank."""
+    embedding_service = MagicMock()
+    embedding_service.get_embedding = AsyncMock(return_value=[0.1, 0.2, 0.3])
+    embedding_service.get_embeddings = AsyncMock(
+        side_effect=lambda texts: [[0.1, 0.2, 0.3] for _ in texts]
+    )
+    db_manager = MagicMock()
+    db_manager.add_documents = AsyncMock()
+    db_manager.query = AsyncMock()
+    db_manager.delete = AsyncMock()
+    db_manager.exists = AsyncMock(return_value=True)
+    db_manager.update = AsyncMock()
+    db_manager.update_metadatas = AsyncMock()
+    db_manager.get_metadata = AsyncMock(return_value={"content_hash": "veraltet"})
+    db_manager.get_embedding = AsyncMock(return_value=[0.4, 0.5, 0.6])
+    db_manager.get_by_ids = AsyncMock()
+    return RetrievalServiceImpl(
+        embedding_service=embedding_service,
+        db_manager=db_manager
+    )
+
+
+def make_document(doc_id: str, content: str) -> Document:
+    """Erstellt ein Testdokument."""
+    return Document(
+        id=doc_id,
+        title=f"Titel {doc_id}",
+        content=content,
+        source_link=f"https://example.com/{doc_id}",
+        document_type=DocumentType.SONSTIGES
+    )
+
+
+def test_detect_language_matches_whole_words(metadata_manager):
+    """Indikatorwörter zählen nur als ganze Wörter."""
+    assert metadata_manager._detect_language(
+        "Der Motor und die Bremse sind geprüft."
+    ) == "de"
+    # "der"/"die"/"das" nur als Teilstrings enthalten
+    assert metadata_manager._detect_language(
+        "modern studies on dashboards"
+    ) == "en"
+
+
+@pytest.mark.asyncio
+async def test_extract_metadata_cached_by_content(metadata_manager):
+    """Identischer Inhalt wird nur einmal analysiert."""
+    content = "Die Prüfung der Bremsanlage ist Pflicht."
+    first = await metadata_manager.extract_metadata(content)
+    second = await metadata_manager.extract_metadata(content)
+    
+    assert len(metadata_manager._meta_cache) == 1
+    assert first["keywords"] == second["keywords"]
+    assert first is not second
+    
+    # Änderungen an zurückgegebenen Listen erreichen den Cache nicht
+    second["topics"].append("geaendert")
+    third = await metadata_manager.extract_metadata(content)
+    assert "geaendert" not in third["topics"]
+    assert isinstance(third["topics"], list)
+
+
+@pytest.mark.asyncio
+async def test_add_documents_batches_embedding_and_insert(retrieval_service):
+    """Mehrere Dokumente werden mit einem Embedding- und Insert-Aufruf gespeichert."""
+    documents = [
+        make_document("doc_1", "Die Wartung des Motors ist wichtig."),
+        make_document("doc_2", "Das Getriebe wird bei der Inspektion geprüft.")
+    ]
+    
+    result = await retrieval_service.add_documents(documents)
+    
+    assert result == documents
+    retrieval_service.embedding_service.get_embeddings.assert_awaited_once()
+    retrieval_service.db.add_documents.assert_awaited_once()
+    call_kwargs = retrieval_service.db.add_documents.call_args.kwargs
+    assert call_kwargs["ids"] == ["doc_1", "doc_2"]
+    assert all("language" in doc.metadata for doc in documents)
+
+
+@pytest.mark.asyncio
+async def test_add_documents_splits_into_insert_batches(retrieval_service, monkeypatch):
+    """Große Dokumentmengen werden in Batches der konfigurierten Größe geschrieben."""
+    monkeypatch.setattr(settings.database, "batch_size", 2)
+    documents = [
+        make_document(f"doc_{i}", f"Die Inspektion Nummer {i} ist abgeschlossen.")
+        for i in range(5)
+    ]
+    
+    await retrieval_service.add_documents(documents)
+    
+    inserted = [
+        call.kwargs["ids"]
+        for call in retrieval_service.db.add_documents.call_args_list
+    ]
+    assert inserted == [["doc_0", "doc_1"], ["doc_2", "doc_3"], ["doc_4"]]
+    assert retrieval_service.embedding_service.get_embeddings.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_update_document_updates_in_place(retrieval_service):
+    """Aktualisierungen schreiben direkt in ChromaDB ohne Löschen."""
+    retrieval_service.db.get_by_ids.return_value = {
+        "ids": [["doc_1"]], "documents": [["Alter Inhalt."]], "metadatas": [[{}]]
+    }
+    document = make_document("doc_1", "Die Inspektion erfolgt jährlich.")
+    
+    updated = await retrieval_service.update_document("doc_1", document)
+    
+    assert updated.id == "doc_1"
+    retrieval_service.db.update.assert_awaited_once()
+    retrieval_service.db.delete.assert_not_awaited()
+    retrieval_service.db.add_documents.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_update_document_reuses_embedding_for_unchanged_content(retrieval_service):
+    """Unveränderter Inhalt wird auch ohne content_hash nicht erneut eingebettet."""
+    content = "Die Inspektion erfolgt jährlich."
+    retrieval_service.db.get_by_ids.return_value = {
+        "ids": [["doc_1"]], "documents": [[content]], "metadatas": [[{}]]
+    }
+    
+    await retrieval_service.update_document("doc_1", make_document("doc_1", content))
+    
+    retrieval_service.embedding_service.get_embedding.assert_not_awaited()
+    call_kwargs = retrieval_service.db.update.call_args.kwargs
+    assert call_kwargs["embedding"] == [0.4, 0.5, 0.6]
+
+
+@pytest.mark.asyncio
+async def test_update_document_returns_none_when_missing(retrieval_service):
+    """Nicht vorhandene Dokumente werden nicht aktualisiert."""
+    retrieval_service.db.get_by_ids.return_value = {
+        "ids": [[]], "documents": [[]], "metadatas": [[]]
+    }
+    
+    result = await retrieval_service.update_document(
+        "doc_1",
+        make_document("doc_1", "Die Inspektion erfolgt jährlich.")
+    )
+    
+    assert result is None
+    retrieval_service.db.update.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_update_document_replaces_chunks(retrieval_service):
+    """Gechunkte Dokumente mit neuem Inhalt werden gelöscht und neu angelegt."""
+    chunk_metadata = [{"chunk_index": i, "total_chunks": 2} for i in range(2)]
+    retrieval_service.db.get_by_ids.side_effect = [
+        {"ids": [["doc_1_chunk_0"]], "documents": [["Teil 0"]],
+         "metadatas": [[chunk_metadata[0]]]},
+        {"ids": [["doc_1_chunk_0", "doc_1_chunk_1"]],
+         "documents": [["Teil 0", "Teil 1"]], "metadatas": [chunk_metadata]},
+    ]
+    document = make_document("neu", "Die Inspektion erfolgt jährlich.")
+    
+    updated = await retrieval_service.update_document("doc_1", document)
+    
+    assert updated.id == "doc_1"
+    retrieval_service.db.delete.assert_awaited_once_with(
+        ["doc_1_chunk_0", "doc_1_chunk_1"]
+    )
+    call_kwargs = retrieval_service.db.add_documents.call_args.kwargs
+    assert call_kwargs["ids"] == ["doc_1"]
+    retrieval_service.db.update.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_update_document_keeps_unchanged_chunks(retrieval_service):
+    """Bei unverändertem Inhalt werden nur die Metadaten der Chunks aktualisiert."""
+    chunk_metadata = [
+        {"chunk_index": i, "total_chunks": 2, "category": "alt"} for i in range(2)
+    ]
+    retrieval_service.db.get_by_ids.side_effect = [
+        {"ids": [["doc_1_chunk_0"]], "documents": [["Teil 0"]],
+         "metadatas": [[chunk_metadata[0]]]},
+        {"ids": [["doc_1_chunk_1", "doc_1_chunk_0"]],
+         "documents": [["Teil 1", "Teil 0"]],
+         "metadatas": [[chunk_metadata[1], chunk_metadata[0]]]},
+    ]
+    document = make_document("doc_1", "Teil 0 Teil 1")
+    document.metadata = {"category": "neu", "chunk_index": 0}
+    
+    await retrieval_service.update_document("doc_1", document)
+    
+    retrieval_service.embedding_service.get_embedding.assert_not_awaited()
+    retrieval_service.db.delete.assert_not_awaited()
+    retrieval_service.db.add_documents.assert_not_awaited()
+    call_kwargs = retrieval_service.db.update_metadatas.call_args.kwargs
+    assert call_kwargs["ids"] == ["doc_1_chunk_0", "doc_1_chunk_1"]
+    assert [m["category"] for m in call_kwargs["metadatas"]] == ["neu", "neu"]
+    assert [m["chunk_index"] for m in call_kwargs["metadatas"]] == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_get_document_reads_chunks_by_id(retrieval_service):
+    """Gechunkte Dokumente werden über ihre Chunk-IDs statt per Filter gelesen."""
+    chunk_metadata = [
+        {"title": "Titel", "source_link": "https://example.com/doc_1",
+         "document_type": "sonstiges", "created_at": "2024-01-01T00:00:00",
+         "chunk_index": i, "total_chunks": 3}
+        for i in range(3)
+    ]
+    retrieval_service.db.get_by_ids.side_effect = [
+        {"ids": [["doc_1_chunk_0"]], "documents": [["Teil 0"]],
+         "metadatas": [[chunk_metadata[0]]]},
+        {"ids": [["doc_1_chunk_2", "doc_1_chunk_0", "doc_1_chunk_1"]],
+         "documents": [["Teil 2", "Teil 0", "Teil 1"]],
+         "metadatas": [[chunk_metadata[2], chunk_metadata[0], chunk_metadata[1]]]},
+    ]
+    
+    document = await retrieval_service.get_document("doc_1")
+    
+    assert document.content == "Teil 0 Teil 1 Teil 2"
+    retrieval_service.db.get_by_ids.assert_awaited_with(
+        ["doc_1_chunk_0", "doc_1_chunk_1", "doc_1_chunk_2"]
+    )
+    retrieval_service.db.query.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_search_results_cached_until_change(retrieval_service):
+    """Identische Suchen nutzen den Cache, Änderungen verwerfen ihn."""
+    document = make_document("doc_1", "Die Inspektion erfolgt jährlich.")
+    retrieval_service._query_by_embedding = AsyncMock(return_value=[document])
+    
+    first = await retrieval_service.search_documents("Inspektion", limit=2)
+    second = await retrieval_service.search_documents("Inspektion", limit=2)
+    
+    assert first == second == [document]
+    assert retrieval_service._query_by_embedding.await_count == 1
+    
+    await retrieval_service.delete_document("doc_1")
+    await retrieval_service.search_documents("Inspektion", limit=2)
+    assert retrieval_service._query_by_embedding.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_search_cache_follows_database_writes(retrieval_service):
+    """Schreibvorgänge anderer Manager entwerten den Cache, Treffer sind Kopien."""
+    document = make_document("doc_1", "Die Inspektion erfolgt jährlich.")
+    retrieval_service._query_by_embedding = AsyncMock(return_value=[document])
+    retrieval_service.db.write_generation = 0
+    
+    first = await retrieval_service.search_documents("Inspektion")
+    first[0].metadata["geaendert"] = True
+    second = await retrieval_service.search_documents("Inspektion")
+    
+    assert "geaendert" not in second[0].metadata
+    assert retrieval_service._query_by_embedding.await_count == 1
+    
+    # Upload über einen anderen Manager auf demselben Verzeichnis
+    retrieval_service.db.write_generation = 1
+    await retrieval_service.search_documents("Inspektion")
+    assert retrieval_service._query_by_embedding.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_similar_documents_use_chunk_centroid(retrieval_service):
+    """Gechunkte Dokumente werden über den Zentroid ihrer Chunks verglichen."""
+    retrieval_service.db.get_embedding.return_value = None
+    retrieval_service.db.get_metadata.return_value = {"total_chunks": 2}
+    retrieval_service.db.get_embeddings = AsyncMock(
+        return_value=np.array([[1.0, 0.0], [0.0, 1.0]], dtype=np.float32)
+    )
+    own_chunk = make_document("doc_1_chunk_1", "Die Inspektion erfolgt jährlich.")
+    own_chunk.metadata["original_id"] = "doc_1"
+    other = make_document("doc_2", "Die Wartung erfolgt monatlich.")
+    retrieval_service._query_by_embedding = AsyncMock(return_value=[own_chunk, other])
+    
+    similar = await retrieval_service.get_similar_documents("doc_1", limit=2)
+    
+    assert similar == [other]
+    retrieval_service.embedding_service.get_embedding.assert_not_awaited()
+    centroid = retrieval_service._query_by_embedding.call_args.args[0]
+    np.testing.assert_allclose(centroid, [0.70710677, 0.70710677], rtol=1e-6)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_searches_share_one_query(retrieval_service):
+    """Gleichzeitige Suchen werden mit einem Multi-Query-Aufruf ausgeführt."""
+    retrieval_service.db.query.return_value = {
+        "ids": [["doc_1"], ["doc_2"]],
+        "documents": [["Inhalt 1"], ["Inhalt 2"]],
+        "metadatas": [[{}], [{}]]
+    }
+    retrieval_service.result_processor.process_search_results = AsyncMock(
+        side_effect=lambda results, include_scores: results["ids"][0]
+    )
+    
+    first, second = await asyncio.gather(
+        retrieval_service.search_by_embedding([0.1, 0.2], limit=1),
+        retrieval_service.search_by_embedding([0.3, 0.4], limit=1)
+    )
+    
+    assert first == ["doc_1"]
+    assert second == ["doc_2"]
+    retrieval_service.db.query.assert_awaited_once()
+    call_kwargs = retrieval_service.db.query.call_args.kwargs
+    assert call_kwargs["query_embeddings"] == [[0.1, 0.2], [0.3, 0.4]]
+
+
+@pytest.mark.asyncio
+async def test_lone_search_skips_batch_window(retrieval_service):
+    """Eine einzelne Suche wartet nicht auf das Bündelungsfenster."""
+    retrieval_service.db.query.return_value = {
+        "ids": [["doc_1"]], "documents": [["Inhalt 1"]], "metadatas": [[{}]]
+    }
+    retrieval_service.result_processor.process_search_results = AsyncMock(
+        side_effect=lambda results, include_scores: results["ids"][0]
+    )
+    retrieval_service._query_batcher._max_wait = 10.0
+    
+    result = await asyncio.wait_for(
+        retrieval_service.search_by_embedding([0.1, 0.2], limit=1),
+        timeout=1.0
+    )
+    
+    assert result == ["doc_1"]
+
+
+@pytest.mark.asyncio
+async def test_search_post_filter_strategy(retrieval_service):
+    """Die Strategie "post" filtert erst nach der Vektorsuche."""
+    retrieval_service.db.query.return_value = {
+        "ids": [[]], "documents": [[]], "metadatas": [[]]
+    }
+    retrieval_service.result_processor.process_search_results = AsyncMock(
+        return_value=[]
+    )
+    
+    await retrieval_service.search_documents(
+        "Inspektion",
+        metadata_filter={"language": "de"},
+        strategy="post"
+    )
+    
+    call_kwargs = retrieval_service.db.query.call_args.kwargs
+    assert call_kwargs["post_filter"] is True
+    assert call_kwargs["where"] == {"language": "de"}
+
+
+@pytest.mark.asyncio
+async def test_search_documents_batch_uses_single_query(retrieval_service):
+    """Mehrere Anfragen werden gemeinsam eingebettet und gesucht."""
+    retrieval_service.db.query.return_value = {
+        "ids": [["doc_1"], ["doc_2"]],
+        "documents": [["Inhalt 1"], ["Inhalt 2"]],
+        "metadatas": [[{}], [{}]]
+    }
+    retrieval_service.result_processor.process_search_results = AsyncMock(
+        side_effect=lambda results, include_scores: results["ids"][0]
+    )
+    
+    results = await retrieval_service.search_documents_batch(
+        ["Bremse", "Motor"],
+        limit=1
+    )
+    
+    assert results == [["doc_1"], ["doc_2"]]
+    retrieval_service.embedding_service.get_embeddings.assert_awaited_once_with(
+        ["Bremse", "Motor"]
+    )
+    retrieval_service.db.query.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_merge_metadata_preserves_order(metadata_manager):
+    """Zusammengeführte Listen behalten die Einfügereihenfolge."""
+    merged = await metadata_manager.merge_metadata(
+        {"topics": ["technik", "wartung"]},
+        {"topics": ["wartung", "recht"]}
+    )
+    
+    assert merged["topics"] == ["technik", "wartung", "recht"]
+    assert "updated_at" in merged
+    
+    unchanged = await metadata_manager.merge_metadata({"topics": ["technik"]}, {})
+    assert "updated_at" not in unchanged
+
+
+@pytest.mark.asyncio
+async def test_merge_metadata_accepts_tuples_and_strings(metadata_manager):
+    """Tupel aus dem Cache und einzelne Strings werden als Listen zusammengeführt."""
+    merged = await metadata_manager.merge_metadata(
+        {"topics": ("technik", "wartung"), "keywords": "bremse"},
+        {"topics": ["recht"], "keywords": ("bremse", "motor")}
+    )
+    
+    assert merged["topics"] == ["technik", "wartung", "recht"]
+    assert merged["keywords"] == ["bremse", "motor"]
+
+
+@pytest.mark.asyncio
+async def test_delete_document_skips_reconstruction(retrieval_service):
+    """Löschen prüft nur die Existenz und rekonstruiert kein Dokument."""
+    assert await retrieval_service.delete_document("doc_1") is True
+    retrieval_service.db.exists.assert_awaited_once_with("doc_1")
+    retrieval_service.db.delete.assert_awaited_once_with(["doc_1"])
+    retrieval_service.db.query.assert_not_awaited()
+    
+    retrieval_service.db.exists.return_value = False
+    retrieval_service.db.get_metadata.return_value = None
+    assert await retrieval_service.delete_document("missing") is False
+
+
+@pytest.mark.asyncio
+async def test_delete_document_removes_chunks_by_id(retrieval_service):
+    """Gechunkte Dokumente werden über ihre Chunk-IDs ohne Filter gelöscht."""
+    retrieval_service.db.exists.return_value = False
+    retrieval_service.db.get_metadata.return_value = {"total_chunks": 3}
+    
+    assert await retrieval_service.delete_document("doc_1") is True
+    retrieval_service.db.get_metadata.assert_awaited_once_with("doc_1_chunk_0")
+    retrieval_service.db.delete.assert_awaited_once_with(
+        ["doc_1_chunk_0", "doc_1_chunk_1", "doc_1_chunk_2"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_metadata_lists_survive_storage_round_trip():
+    """Listen-Metadaten kommen unverändert als Listen aus ChromaDB zurück."""
+    stored = _normalize_metadata({
+        "title": "Titel",
+        "created_at": "2024-01-01T00:00:00",
+        "topics": ["technik", "wartung, reparatur"],
+        "keywords": ["bremse", "abs"]
+    })
+    legacy = {**stored, "topics": "technik, wartung", "keywords": "bremse"}
+    results = {
+        "ids": [["doc_1", "doc_2"]],
+        "documents": [["Die Inspektion erfolgt jährlich.", "Die Wartung erfolgt."]],
+        "metadatas": [[stored, legacy]]
+    }
+    
+    documents = await ResultProcessor().process_search_results(results)
+    
+    assert documents[0].topics == ["technik", "wartung, reparatur"]
+    assert documents[0].metadata["keywords"] == ["bremse", "abs"]
+    assert documents[1].topics == ["technik", "wartung"]
+    assert documents[1].metadata["keywords"] == ["bremse"]